@@ -0,0 +1,103 @@
+"""Throughput of title normalization: the regex-based normalize_text it
+replaced, per-title calls, and batched normalize_many/lookup_keys.
+
+Pure CPU, no database needed:
+
+    python -m benchmarks.normalize_text --titles 1000000
+"""
+
+import argparse
+import random
+import re
+from time import perf_counter
+
+from mader_project.functions.normalize_text import (
+    lookup_key,
+    lookup_keys,
+    normalize_many,
+    normalize_text,
+)
+
+WORDS = (
+    'Memórias Póstumas de Brás Cubas Dom Casmurro O Cortiço Iracema '
+    'Senhora A Hora da Estrela Vidas Secas Grande Sertão: Veredas '
+    'Capitães Areia Macunaíma Quincas Borba Triste Fim Policarpo '
+    'Quaresma Menino Engenho Ensaio sobre Cegueira Auto Compadecida '
+    'Morte Vida Severina Gabriela, Cravo Canela 1984 Volume II Noite '
+    'São Paulo Amar, Verbo Intransitivo Água Viva Perto Coração Selvagem'
+).split()
+
+
+def legacy_normalize_text(text: str):
+    text_normalized = ' '.join(text.split()).strip().lower()
+    return re.sub(r'[^a-zA-A\s]', '', text_normalized)
+
+
+def make_titles(count: int) -> list[str]:
+    rng = random.Random(42)
+    titles = []
+
+    for _ in range(count):
+        title = ' '.join(rng.choices(WORDS, k=rng.randint(2, 7)))
+        # A few messy inputs, as they arrive from forms and CSV files
+        if rng.random() < 0.02:  # noqa: PLR2004
+            title = f' {title.upper()}  '
+        titles.append(title)
+
+    return titles
+
+
+def measure(label: str, func, titles: list[str], baseline, runs: int):
+    timings = []
+    for _ in range(runs):
+        started_at = perf_counter()
+        func(titles)
+        timings.append(perf_counter() - started_at)
+    seconds = min(timings)
+
+    speedup = f'{baseline / seconds:5.1f}x' if baseline else '    -'
+    print(
+        f'  {label:<28} {seconds:7.3f}s '
+        f'{len(titles) / seconds:>12,.0f} titles/s {speedup}'
+    )
+    return seconds
+
+
+def main(count: int, runs: int):
+    titles = make_titles(count)
+    assert normalize_many(titles) == [normalize_text(t) for t in titles]
+    assert lookup_keys(titles) == [lookup_key(t) for t in titles]
+
+    print(f'{count:,} titles, best of {runs}:')
+    baseline = measure(
+        'legacy normalize_text',
+        lambda items: [legacy_normalize_text(item) for item in items],
+        titles,
+        None,
+        runs,
+    )
+    measure(
+        'normalize_text per title',
+        lambda items: [normalize_text(item) for item in items],
+        titles,
+        baseline,
+        runs,
+    )
+    measure('normalize_many', normalize_many, titles, baseline, runs)
+    measure(
+        'lookup_key per title',
+        lambda items: [lookup_key(item) for item in items],
+        titles,
+        baseline,
+        runs,
+    )
+    measure('lookup_keys', lookup_keys, titles, baseline, runs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--titles', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.titles, args.runs)
@@ -0,0 +1,167 @@
+"""Throughput of the catalog read routes against the connection pool size.
+
+Drives the app in-process over ASGI with a fixed number of concurrent
+clients, once per pool size, on a migrated and populated DATABASE_URL
+(e.g. loaded with mader_project.importer). Auth and the response cache
+are bypassed so every request reaches the pool:
+
+    python -m benchmarks.pool_load --sizes 1,2,4,8,16 --workers 4
+"""
+
+import argparse
+import asyncio
+import random
+from concurrent.futures import ProcessPoolExecutor
+from statistics import quantiles
+from time import perf_counter
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mader_project import database
+from mader_project.app import app
+from mader_project.response_cache import response_cache
+from mader_project.schemas import Principal
+from mader_project.security import get_current_user
+
+
+def make_paths(
+    book_ids: tuple[int, int], novelist_ids: tuple[int, int], seed: int
+):
+    rng = random.Random(seed)
+
+    def next_path():
+        choice = rng.random()
+        if choice < 0.4:  # noqa: PLR2004
+            return f'/books/get-book/{rng.randint(*book_ids)}'
+        if choice < 0.6:  # noqa: PLR2004
+            return f'/novelists/novelist/{rng.randint(*novelist_ids)}'
+        if choice < 0.9:  # noqa: PLR2004
+            return '/books/list-all-books?limit=20'
+        return '/search?q=dom'
+
+    return next_path
+
+
+async def drive(pool_size: int, concurrency: int, requests: int, next_path):
+    database.settings.DATABASE_POOL_SIZE = pool_size
+    database.settings.DATABASE_MAX_OVERFLOW = 0
+    engine = database.build_engine(database.settings.DATABASE_URL)
+
+    async def get_session():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[database.get_session] = get_session
+    app.dependency_overrides[get_current_user] = lambda: Principal(
+        id=0, name='bench', email='bench@example.com'
+    )
+    response_cache.backend = None
+
+    latencies = []
+    remaining = requests
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started_at = perf_counter()
+            response = await client.get(next_path())
+            latencies.append(perf_counter() - started_at)
+            assert response.status_code < 500  # noqa: PLR2004
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        started_at = perf_counter()
+        await asyncio.gather(
+            *(client_loop(client) for _ in range(concurrency))
+        )
+        elapsed = perf_counter() - started_at
+
+    stats = engine.pool.stats()  # type: ignore
+    await engine.dispose()
+
+    return latencies, elapsed, stats['wait_seconds'], stats['checkouts']
+
+
+def worker(job: tuple):
+    # One process per worker, like uvicorn --workers, each with its own
+    # event loop and pool
+    pool_size, concurrency, requests, book_ids, novelist_ids, seed = job
+    return asyncio.run(
+        drive(
+            pool_size,
+            concurrency,
+            requests,
+            make_paths(book_ids, novelist_ids, seed),
+        )
+    )
+
+
+async def id_ranges():
+    engine = database.build_engine(database.settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        book_ids = (
+            await conn.execute(text('SELECT min(id), max(id) FROM books'))
+        ).one()
+        novelist_ids = (
+            await conn.execute(text('SELECT min(id), max(id) FROM novelists'))
+        ).one()
+    await engine.dispose()
+
+    return tuple(book_ids), tuple(novelist_ids)
+
+
+def main(sizes: list[int], workers: int, concurrency: int, requests: int):
+    book_ids, novelist_ids = asyncio.run(id_ranges())
+
+    print(
+        f'{workers} worker(s) x {concurrency} concurrent clients, '
+        f'{requests:,} requests per pool size:'
+    )
+    for size in sizes:
+        jobs = [
+            (
+                size,
+                concurrency,
+                requests // workers,
+                book_ids,
+                novelist_ids,
+                seed,
+            )
+            for seed in range(workers)
+        ]
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(worker, jobs))
+
+        latencies = [latency for result in results for latency in result[0]]
+        elapsed = max(result[1] for result in results)
+        wait_seconds = sum(result[2] for result in results)
+        checkouts = sum(result[3] for result in results)
+
+        p50, p95 = (quantiles(latencies, n=100)[i] for i in (49, 94))
+        print(
+            f'  pool {size:>3} x {workers}: '
+            f'{len(latencies) / elapsed:8,.0f} req/s  '
+            f'p50 {p50 * 1000:6.1f}ms  p95 {p95 * 1000:6.1f}ms  '
+            f'pool wait {wait_seconds / checkouts * 1000:6.2f}ms/checkout'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='1,2,4,8,16,32')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=5_000)
+    args = parser.parse_args()
+
+    main(
+        [int(size) for size in args.sizes.split(',')],
+        args.workers,
+        args.concurrency,
+        args.requests,
+    )
@@ -0,0 +1,126 @@
+"""Plans and latencies of the title/name substring searches, before and
+after the trigram indexes from migration 5c1e7d2a9b40.
+
+Seeds a scratch schema on DATABASE_URL (dropped afterwards):
+
+    python -m benchmarks.search_indexes --rows 2000000
+"""
+
+import argparse
+import asyncio
+import json
+from statistics import median
+from time import perf_counter
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from mader_project.functions.search import contains_pattern
+from mader_project.settings import Settings
+
+SCHEMA = 'bench_search'
+
+SETUP = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE',
+    f'CREATE SCHEMA {SCHEMA}',
+    f'CREATE TABLE {SCHEMA}.novelists (id serial PRIMARY KEY, name text)',
+    f"""CREATE TABLE {SCHEMA}.books (
+        id serial PRIMARY KEY, title text UNIQUE, year integer,
+        id_novelist integer
+    )""",
+    f"""INSERT INTO {SCHEMA}.novelists (name)
+        SELECT 'novelist ' || md5(i::text)
+        FROM generate_series(1, :rows / 20) AS i""",
+    f"""INSERT INTO {SCHEMA}.books (title, year, id_novelist)
+        SELECT 'book ' || md5(i::text) || ' ' || md5((i * 7)::text),
+               1800 + i % 225, 1 + i % (:rows / 20)
+        FROM generate_series(1, :rows) AS i""",
+]
+
+INDEXES = [
+    f"""CREATE INDEX ix_books_title_trgm ON {SCHEMA}.books
+        USING gin (title gin_trgm_ops)""",
+    f"""CREATE INDEX ix_novelists_name_trgm ON {SCHEMA}.novelists
+        USING gin (name gin_trgm_ops)""",
+    f'CREATE INDEX ix_books_year ON {SCHEMA}.books (year)',
+]
+
+# Mirrors list_books_by_year and get_novelists_by_filter_name
+QUERIES = {
+    'books by title and year': (
+        f"""SELECT * FROM {SCHEMA}.books
+            WHERE title ILIKE :pattern ESCAPE '\\' AND year = :year
+            ORDER BY id LIMIT 51""",
+        {'pattern': contains_pattern('a1b2'), 'year': 1900},
+    ),
+    'novelists by name': (
+        f"""SELECT * FROM {SCHEMA}.novelists
+            WHERE name ILIKE :pattern ESCAPE '\\'
+            ORDER BY id LIMIT 51""",
+        {'pattern': contains_pattern('c3d4')},
+    ),
+}
+
+
+async def measure(conn: AsyncConnection, runs: int):
+    for label, (sql, params) in QUERIES.items():
+        plan = (
+            await conn.execute(
+                text(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}'), params
+            )
+        ).scalar()
+        plan = plan if isinstance(plan, list) else json.loads(plan)
+
+        timings = []
+        for _ in range(runs):
+            started_at = perf_counter()
+            await conn.execute(text(sql), params)
+            timings.append((perf_counter() - started_at) * 1000)
+
+        print(
+            f'  {label:<26} plan={plan_nodes(plan[0]["Plan"])} '
+            f'median={median(timings):.2f}ms'
+        )
+
+
+def plan_nodes(node: dict) -> str:
+    name = node['Node Type']
+    if 'Index Name' in node:
+        name += f'({node["Index Name"]})'
+    children = [plan_nodes(child) for child in node.get('Plans', [])]
+    return f'{name}[{", ".join(children)}]' if children else name
+
+
+async def main(rows: int, runs: int):
+    engine = create_async_engine(Settings().DATABASE_URL)  # type: ignore
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level='AUTOCOMMIT')
+        print(f'seeding {rows:,} books...')
+        for statement in SETUP:
+            await conn.execute(text(statement), {'rows': rows})
+        await conn.execute(text(f'ANALYZE {SCHEMA}.books, {SCHEMA}.novelists'))
+
+        print('before:')
+        await measure(conn, runs)
+
+        for statement in INDEXES:
+            await conn.execute(text(statement))
+        await conn.execute(text(f'ANALYZE {SCHEMA}.books, {SCHEMA}.novelists'))
+
+        print('after:')
+        await measure(conn, runs)
+
+        await conn.execute(text(f'DROP SCHEMA {SCHEMA} CASCADE'))
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.runs))
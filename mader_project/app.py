@@ -1,16 +1,42 @@
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI
 
-from mader_project.routes import auth, books, novelists, users
+from mader_project.change_stream import change_listener
+from mader_project.hashing import password_hasher
+from mader_project.response_cache import response_cache
+from mader_project.routes import (
+    auth,
+    books,
+    changes,
+    export,
+    metrics,
+    novelists,
+    search,
+    users,
+)
 from mader_project.schemas import Message
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    password_hasher.shutdown()
+    await response_cache.close()
+    await change_listener.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(books.router)
 app.include_router(novelists.router)
+app.include_router(search.router)
+app.include_router(changes.router)
+app.include_router(export.router)
+app.include_router(metrics.router)
 
 
 @app.get('/', status_code=HTTPStatus.OK, response_model=Message)
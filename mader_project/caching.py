@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class TTLCache:
+    """Size-bounded LRU mapping whose entries expire after a TTL.
+
+    Process-local: every worker keeps its own copy, so the TTL is what
+    bounds staleness for writes made through another worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
@@ -0,0 +1,165 @@
+import asyncio
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+
+import psycopg
+from fastapi import HTTPException
+from sqlalchemy import make_url
+
+from mader_project.settings import Settings
+
+settings = Settings()  # type: ignore
+
+CHANNEL = 'catalog_changes'
+
+
+@dataclass
+class StreamMetrics:
+    subscribers: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    reconnects: int = 0
+
+
+@dataclass(frozen=True)
+class StreamEvent:
+    name: str
+    data: str
+
+    def encode(self) -> str:
+        return f'event: {self.name}\ndata: {self.data}\n\n'
+
+
+# Sent to a subscriber in place of its backlog when it is dropped, and to
+# everyone after the listener reconnects: notifications sent while it was
+# down are lost, so clients should catch up through /changes
+OVERFLOW = StreamEvent('overflow', '{}')
+RESET = StreamEvent('reset', '{}')
+
+
+class Subscription:
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue[StreamEvent | None] = asyncio.Queue(max_size)
+
+    async def get(self, timeout: float) -> StreamEvent | None:
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ChangeListener:
+    """Fans catalog change notifications out to SSE subscribers.
+
+    One LISTEN connection per worker, opened on the first subscription
+    and reopened if it drops. Each subscriber gets a bounded queue; one
+    that falls `queue_size` events behind is sent OVERFLOW and cut off
+    rather than letting its backlog grow or slowing the others.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        queue_size: int,
+        connect_timeout: float = 5.0,
+        retry_seconds: float = 1.0,
+    ):
+        self.url = url
+        self.queue_size = queue_size
+        self.connect_timeout = connect_timeout
+        self.retry_seconds = retry_seconds
+        self.metrics = StreamMetrics()
+        self._subscriptions: set[Subscription] = set()
+        self._task: asyncio.Task | None = None
+        self._listening: asyncio.Event | None = None
+
+    async def subscribe(self) -> Subscription:
+        if self._task is None or self._task.done():
+            self._listening = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+
+        try:
+            await asyncio.wait_for(
+                self._listening.wait(),  # type: ignore
+                self.connect_timeout,
+            )
+        except TimeoutError:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Change stream unavailable!',
+            )
+
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        self.metrics.subscribers = len(self._subscriptions)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+        self.metrics.subscribers = len(self._subscriptions)
+
+    def publish(self, event: StreamEvent):
+        for subscription in list(self._subscriptions):
+            try:
+                subscription.queue.put_nowait(event)
+                self.metrics.delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def stats(self) -> dict:
+        return asdict(self.metrics) | {'listening': self.listening}
+
+    @property
+    def listening(self) -> bool:
+        return self._listening is not None and self._listening.is_set()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._listening = None
+
+        for subscription in list(self._subscriptions):
+            self._end(subscription, None)
+
+    def _drop(self, subscription: Subscription):
+        self._end(subscription, OVERFLOW)
+        self.metrics.dropped += 1
+
+    def _end(self, subscription: Subscription, event: StreamEvent | None):
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(event)
+
+    async def _listen(self):
+        while True:
+            try:
+                await self._listen_once()
+            except psycopg.Error:
+                pass
+
+            self._listening.clear()  # type: ignore
+            self.metrics.reconnects += 1
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _listen_once(self):
+        # The SQLAlchemy URL names the driver, which libpq doesn't accept
+        url = make_url(self.url).set(drivername='postgresql')
+
+        async with await psycopg.AsyncConnection.connect(
+            url.render_as_string(hide_password=False), autocommit=True
+        ) as conn:
+            await conn.execute(f'LISTEN {CHANNEL}')
+            if self.metrics.reconnects:
+                self.publish(RESET)
+            self._listening.set()  # type: ignore
+
+            async for notify in conn.notifies():
+                self.publish(StreamEvent('change', notify.payload))
+
+
+change_listener = ChangeListener(
+    settings.DATABASE_URL, queue_size=settings.CHANGE_STREAM_QUEUE_SIZE
+)
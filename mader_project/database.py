@@ -1,8 +1,129 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from dataclasses import asdict, dataclass
+from time import perf_counter
 
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from mader_project.caching import TTLCache
 from mader_project.settings import Settings
 
-engine = create_async_engine(Settings().DATABASE_URL)  # type: ignore
+settings = Settings()  # type: ignore
+
+
+@dataclass
+class PoolMetrics:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout.
+
+    Wait time covers queueing for a free connection plus opening a new
+    one or pre-pinging, i.e. everything a request spends before its
+    first query can run.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            waited = perf_counter() - started_at
+            self.metrics.checkouts += 1
+            self.metrics.wait_seconds += waited
+            self.metrics.max_wait_seconds = max(
+                self.metrics.max_wait_seconds, waited
+            )
+
+    def recreate(self):
+        # dispose() swaps in a new pool; keep the counters going
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> dict:
+        return asdict(self.metrics) | {
+            'size': self.size(),
+            'max_overflow': self._max_overflow,
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': max(self.overflow(), 0),
+        }
+
+
+def build_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=MeteredPool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args={
+            'prepare_threshold': settings.DATABASE_PREPARE_THRESHOLD
+        },
+    )
+
+
+engine = build_engine(settings.DATABASE_URL)
+replica_engine = (
+    build_engine(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+# Users who committed a write recently; their reads stay on the primary
+# until the replica has had time to replay it. Process-local like the
+# other caches, so a worker that didn't serve the write won't pin.
+primary_pins = TTLCache(
+    maxsize=settings.READ_YOUR_WRITES_MAX_USERS,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_statement_writes(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_flush_writes(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _pin_writer_to_primary(session):
+    # get_current_user records who the session is acting for
+    principal_id = session.info.get('principal_id')
+    if session.info.pop('wrote', False) and principal_id is not None:
+        primary_pins.set(principal_id, True)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_rolled_back_writes(session, previous_transaction):
+    session.info.pop('wrote', None)
 
 
 async def get_session():  # pragma: no cover
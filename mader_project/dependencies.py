@@ -1,12 +1,72 @@
+from contextlib import asynccontextmanager
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Query, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
+from mader_project import database
 from mader_project.database import AsyncSession, get_session
-from mader_project.models import User
-from mader_project.security import get_current_user
+from mader_project.functions.lookup import parse_ids
+from mader_project.response_cache import response_cache
+from mader_project.schemas import PageParams, Principal
+from mader_project.security import get_current_user, get_stream_user
+
+
+def get_page_params(
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: str | None = None,
+):
+    return PageParams(limit=limit, cursor=cursor)
+
+
+def get_lookup_ids(ids: Annotated[list[str], Query()]):
+    return parse_ids(ids)
+
 
 Session = Annotated[AsyncSession, Depends(get_session)]
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+StreamUser = Annotated[Principal, Depends(get_stream_user)]
 OAuthForm = Annotated[OAuth2PasswordRequestForm, Depends()]
+Pagination = Annotated[PageParams, Depends(get_page_params)]
+LookupIds = Annotated[list[int], Depends(get_lookup_ids)]
+
+
+async def get_read_session(
+    request: Request, session: Session, current_user: CurrentUser
+):
+    """Replica session for GET routes. Falls back to the request's
+    primary session when no replica is configured, or while the user is
+    inside the read-your-writes window after a write of their own."""
+    if database.replica_engine is None or database.primary_pins.get(
+        current_user.id
+    ):
+        yield session
+        return
+
+    async with AsyncSession(
+        database.replica_engine, expire_on_commit=False
+    ) as replica_session:
+        # Keeps ResponseCache.respond from caching what it reads
+        request.state.replica_read = True
+        yield replica_session
+
+
+async def get_cached_read_session(
+    request: Request, session: Session, current_user: CurrentUser
+):
+    """Session for GET routes served through ResponseCache.respond.
+    With a cache backend these read from the primary: a miss read from
+    the replica is never stored, so the cache would stay empty for
+    every user not pinned by a recent write."""
+    if response_cache.backend is not None:
+        yield session
+        return
+
+    async with asynccontextmanager(get_read_session)(
+        request, session, current_user
+    ) as read_session:
+        yield read_session
+
+
+ReadSession = Annotated[AsyncSession, Depends(get_read_session)]
+CachedReadSession = Annotated[AsyncSession, Depends(get_cached_read_session)]
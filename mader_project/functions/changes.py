@@ -0,0 +1,61 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import BigInteger, Text, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mader_project.models import ChangeLog
+
+
+def encode_change_cursor(txid: int, change_id: int) -> str:
+    return urlsafe_b64encode(json.dumps([txid, change_id]).encode()).decode()
+
+
+def decode_change_cursor(cursor: str) -> tuple[int, int]:
+    try:
+        txid, change_id = json.loads(urlsafe_b64decode(cursor.encode()))
+        return int(txid), int(change_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor!'
+        )
+
+
+async def read_changes(
+    since: str | None, limit: int, session: AsyncSession
+) -> tuple[list[ChangeLog], str | None, bool]:
+    """Changes after `since`, ordered by (txid, id).
+
+    Ids are handed out before commit, so a slow transaction could commit
+    an id below one a client has already passed. Only transactions older
+    than the snapshot's xmin are returned: all of them have finished, and
+    anything still running or yet to start sorts after them.
+    """
+    horizon = func.pg_snapshot_xmin(func.pg_current_snapshot())
+    query = select(ChangeLog).where(
+        ChangeLog.txid < horizon.cast(Text).cast(BigInteger)
+    )
+
+    if since:
+        query = query.where(
+            tuple_(ChangeLog.txid, ChangeLog.id)
+            > tuple_(*decode_change_cursor(since))
+        )
+
+    changes = (
+        await session.scalars(
+            query.order_by(ChangeLog.txid, ChangeLog.id).limit(limit + 1)
+        )
+    ).all()
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    next_cursor = since
+    if changes:
+        next_cursor = encode_change_cursor(changes[-1].txid, changes[-1].id)
+
+    return list(changes), next_cursor, has_more
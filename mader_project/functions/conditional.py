@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+
+from fastapi import Request
+from sqlalchemy import Select, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from mader_project.functions.pagination import page_limit, page_window
+from mader_project.schemas import PageParams
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: datetime | None = None
+
+    def headers(self) -> dict[str, str]:
+        headers = {'ETag': self.etag}
+        if self.last_modified is not None:
+            headers['Last-Modified'] = format_datetime(
+                self.last_modified, usegmt=True
+            )
+        return headers
+
+    def not_modified(self, request: Request) -> bool:
+        # If-None-Match wins over If-Modified-Since (RFC 9110, 13.2.2)
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is not None:
+            tags = {
+                tag.strip().removeprefix('W/')
+                for tag in if_none_match.split(',')
+            }
+            return '*' in tags or self.etag in tags
+
+        if_modified_since = request.headers.get('if-modified-since')
+        if if_modified_since is None or self.last_modified is None:
+            return False
+
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        return self.last_modified <= as_utc(since)
+
+
+def as_utc(moment: datetime) -> datetime:
+    # Timestamps are stored naive, in the database's (UTC) clock
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def make_etag(*parts) -> str:
+    digest = blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+async def row_validators(
+    model, row_id: int, session: AsyncSession
+) -> Validators | None:
+    updated_at = await session.scalar(
+        select(model.updated_at).where(model.id == row_id)
+    )
+    if updated_at is None:
+        return None
+
+    return Validators(
+        etag=make_etag(model.__tablename__, row_id, updated_at.isoformat()),
+        last_modified=as_utc(updated_at).replace(microsecond=0),
+    )
+
+
+async def page_validators(
+    query: Select,
+    id_column: InstrumentedAttribute[int],
+    page: PageParams,
+    session: AsyncSession,
+) -> Validators:
+    """Validators for the keyset page `paginate` would return.
+
+    Digests every (id, updated_at) pair of the same `limit + 1` window
+    without loading rows, so inserts, deletes and updates inside it all
+    change the ETag. max(updated_at) alone would miss updates: now() is
+    the transaction's start, so one that commits late can stamp a row
+    below the current max.
+
+    No Last-Modified, for the same reason: If-Modified-Since would
+    answer 304 to a page changed by such an update, or by a delete.
+    """
+    updated_at = id_column.class_.updated_at
+    window = page_window(
+        query.with_only_columns(id_column, updated_at), id_column, page
+    ).subquery()
+    row_id = window.c[id_column.key]
+
+    digest = await session.scalar(
+        select(
+            func.md5(
+                func.string_agg(
+                    func.concat(row_id, ':', window.c[updated_at.key]),
+                    aggregate_order_by(literal_column("','"), row_id),
+                )
+            )
+        )
+    )
+
+    return Validators(
+        etag=make_etag(
+            id_column.class_.__tablename__,
+            page.cursor,
+            page_limit(page),
+            digest,
+        )
+    )
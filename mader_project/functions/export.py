@@ -0,0 +1,57 @@
+import csv
+import io
+from typing import Literal
+
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ExportFormat = Literal['ndjson', 'csv']
+
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def _to_ndjson(rows, schema: type[BaseModel]) -> str:
+    return ''.join(
+        schema.model_validate(row).model_dump_json() + '\n' for row in rows
+    )
+
+
+def _to_csv(rows, schema: type[BaseModel], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    fields = list(schema.model_fields)
+
+    if header:
+        writer.writerow(fields)
+
+    writer.writerows([getattr(row, field) for field in fields] for row in rows)
+
+    return buffer.getvalue()
+
+
+async def stream_export(
+    query: Select,
+    schema: type[BaseModel],
+    export_format: ExportFormat,
+    fetch_size: int,
+    session: AsyncSession,
+):
+    # Dependencies with yield are torn down before a StreamingResponse
+    # body runs, so the stream owns the session and closes it itself.
+    try:
+        result = await session.stream_scalars(
+            query.execution_options(yield_per=fetch_size)
+        )
+
+        if export_format == 'csv':
+            yield _to_csv([], schema, header=True)
+
+        async for partition in result.partitions():
+            if export_format == 'csv':
+                yield _to_csv(partition, schema)
+            else:
+                yield _to_ndjson(partition, schema)
+
+    finally:
+        await session.close()
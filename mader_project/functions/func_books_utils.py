@@ -1,7 +1,6 @@
 from http import HTTPStatus
 
 from fastapi import HTTPException
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from mader_project.models import Book
@@ -16,16 +15,3 @@ async def verify_existing_book_by_id(book_id: int, session: AsyncSession):
         )
 
     return book_db
-
-
-async def verify_existing_book_by_title(
-    book_title: str, session: AsyncSession
-):
-    book_db = await session.scalar(
-        select(Book).where(Book.title == book_title)
-    )
-
-    if book_db:
-        raise HTTPException(
-            status_code=HTTPStatus.CONFLICT, detail='Book already exists!'
-        )
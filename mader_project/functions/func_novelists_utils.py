@@ -1,23 +1,14 @@
 from http import HTTPStatus
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from mader_project.models import Novelist
+from mader_project.models import Book, Novelist
+from mader_project.schemas import NovelistAllInfoSchema
+from mader_project.settings import Settings
 
-
-async def verify_existing_novelist_by_name(
-    novel_name: str, session: AsyncSession
-):
-    noveslit_db = await session.scalar(
-        select(Novelist).where(Novelist.name == novel_name)
-    )
-
-    if noveslit_db:
-        raise HTTPException(
-            status_code=HTTPStatus.CONFLICT, detail='Novelist already exists!'
-        )
+settings = Settings()  # type: ignore
 
 
 async def verify_existing_novelist_by_id(novel_id: int, session: AsyncSession):
@@ -29,3 +20,68 @@ async def verify_existing_novelist_by_id(novel_id: int, session: AsyncSession):
         )
 
     return novelist_db
+
+
+async def existing_novelist_ids(
+    novelist_ids: set[int], session: AsyncSession
+) -> set[int]:
+    if not novelist_ids:
+        return set()
+
+    return set(
+        await session.scalars(
+            select(Novelist.id).where(Novelist.id.in_(novelist_ids))
+        )
+    )
+
+
+async def novelist_books_preview(
+    novelist_ids: list[int], limit: int, session: AsyncSession
+) -> dict[int, list[Book]]:
+    # First `limit` books per novelist in one query, however many each has
+    position = (
+        func
+        .row_number()
+        .over(partition_by=Book.id_novelist, order_by=Book.id)
+        .label('position')
+    )
+    ranked = (
+        select(Book.id, position)
+        .where(Book.id_novelist.in_(novelist_ids))
+        .subquery()
+    )
+
+    books = await session.scalars(
+        select(Book)
+        .join(ranked, ranked.c.id == Book.id)
+        .where(ranked.c.position <= limit)
+        .order_by(Book.id_novelist, Book.id)
+    )
+
+    preview: dict[int, list[Book]] = {
+        novelist_id: [] for novelist_id in novelist_ids
+    }
+    for book in books:
+        preview[book.id_novelist].append(book)
+
+    return preview
+
+
+async def with_books(
+    novelists: list[Novelist], session: AsyncSession
+) -> list[dict]:
+    payloads = [
+        NovelistAllInfoSchema.model_validate(novelist).model_dump()
+        for novelist in novelists
+    ]
+
+    if novelists:
+        preview = await novelist_books_preview(
+            [novelist.id for novelist in novelists],
+            settings.NOVELIST_BOOKS_LIMIT,
+            session,
+        )
+        for payload in payloads:
+            payload['books'] = preview[payload['id']]
+
+    return payloads
@@ -1,40 +1,21 @@
 from http import HTTPStatus
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from mader_project.models import User
-from mader_project.schemas import UserSchema
+from mader_project.models import Book, Read_Books_Association, User
+from mader_project.schemas import UserExpand, UserPublic
+from mader_project.settings import Settings
 
-
-# Users Util Fuctions
-async def verify_existing_user_by_name_and_email(
-    user: UserSchema, session: AsyncSession
-):
-    user_db = await session.scalar(
-        select(User).where(
-            (User.name == user.name) | (User.email == user.email)
-        )
-    )
-
-    if user_db:
-        if user_db.name == user.name:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail='Username already exists!',
-            )
-        raise HTTPException(
-            status_code=HTTPStatus.CONFLICT, detail='Email already exists!'
-        )
+settings = Settings()  # type: ignore
 
 
+# Users Util Fuctions
 async def verify_existing_user_by_id(user_id: int, session: AsyncSession):
     user_db = await session.scalar(
-        select(User)
-        .where(User.id == user_id, User.status)
-        .options(selectinload(User.read_books))
+        select(User).where(User.id == user_id, User.status)
     )
 
     if not user_db:
@@ -50,3 +31,75 @@ def verify_similar_user_id(c_user_id: int, user_id: int):
         raise HTTPException(
             status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission!'
         )
+
+
+async def add_read_books(
+    user_id: int, book_ids: list[int], session: AsyncSession
+):
+    found_ids = set(
+        await session.scalars(select(Book.id).where(Book.id.in_(book_ids)))
+    )
+
+    if found_ids != set(book_ids):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Book not found!'
+        )
+
+    await session.execute(
+        insert(Read_Books_Association)
+        .values([
+            {'user_id': user_id, 'book_id': book_id} for book_id in found_ids
+        ])
+        .on_conflict_do_nothing()
+    )
+    await session.commit()
+
+
+async def read_books_preview(
+    user_ids: list[int], limit: int, session: AsyncSession
+) -> dict[int, list[Book]]:
+    # First `limit` books per user in one query, however long each list is
+    position = (
+        func
+        .row_number()
+        .over(partition_by=Read_Books_Association.user_id, order_by=Book.id)
+        .label('position')
+    )
+    ranked = (
+        select(
+            Read_Books_Association.user_id, Book.id.label('book_id'), position
+        )
+        .join(Book, Book.id == Read_Books_Association.book_id)
+        .where(Read_Books_Association.user_id.in_(user_ids))
+        .subquery()
+    )
+
+    rows = await session.execute(
+        select(ranked.c.user_id, Book)
+        .join(Book, Book.id == ranked.c.book_id)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.user_id, Book.id)
+    )
+
+    preview: dict[int, list[Book]] = {user_id: [] for user_id in user_ids}
+    for user_id, book in rows:
+        preview[user_id].append(book)
+
+    return preview
+
+
+async def expand_users(
+    users: list[User], expand: UserExpand | None, session: AsyncSession
+) -> list[dict]:
+    payloads = [UserPublic.model_validate(user).model_dump() for user in users]
+
+    if expand == 'read_books' and users:
+        preview = await read_books_preview(
+            [user.id for user in users],
+            settings.READ_BOOKS_EXPAND_LIMIT,
+            session,
+        )
+        for payload in payloads:
+            payload['read_books'] = preview[payload['id']]
+
+    return payloads
@@ -0,0 +1,34 @@
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Keyed by the constraint or unique index name reported by Postgres
+CONSTRAINT_ERRORS = {
+    'ix_books_title_key': (HTTPStatus.CONFLICT, 'Book already exists!'),
+    'ix_novelists_name_key': (
+        HTTPStatus.CONFLICT,
+        'Novelist already exists!',
+    ),
+    'users_name_key': (HTTPStatus.CONFLICT, 'Username already exists!'),
+    'users_email_key': (HTTPStatus.CONFLICT, 'Email already exists!'),
+    'books_id_novelist_fkey': (HTTPStatus.NOT_FOUND, 'Novelist not found!'),
+}
+
+
+@asynccontextmanager
+async def translate_integrity_errors(session: AsyncSession):
+    try:
+        yield
+
+    except IntegrityError as exc:
+        await session.rollback()
+
+        constraint = getattr(exc.orig.diag, 'constraint_name', None)  # type: ignore
+        if constraint not in CONSTRAINT_ERRORS:
+            raise
+
+        status_code, detail = CONSTRAINT_ERRORS[constraint]
+        raise HTTPException(status_code=status_code, detail=detail) from exc
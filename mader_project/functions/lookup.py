@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, Select, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from mader_project.settings import Settings
+
+settings = Settings()  # type: ignore
+
+
+def parse_ids(values: list[str]) -> list[int]:
+    # Accepts ?ids=3&ids=1 as well as ?ids=3,1; duplicates keep their
+    # first position
+    try:
+        ids = [
+            int(part)
+            for value in values
+            for part in value.split(',')
+            if part.strip()
+        ]
+    except ValueError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid ids!'
+        )
+
+    ids = list(dict.fromkeys(ids))
+
+    if not ids:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid ids!'
+        )
+
+    if len(ids) > settings.BULK_LOOKUP_MAX_IDS:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail='Too many ids!',
+        )
+
+    return ids
+
+
+async def lookup_by_ids(
+    query: Select,
+    id_column: InstrumentedAttribute[int],
+    ids: list[int],
+    session: AsyncSession,
+):
+    """Rows for `ids` in request order, plus the ids not found.
+
+    One `id = ANY(:ids)` query with the ids bound as a single array, so
+    the statement, and its prepared plan, is the same for any count.
+    """
+    rows = {
+        row.id: row
+        for row in await session.scalars(
+            query.where(id_column == any_(literal(ids, ARRAY(Integer))))
+        )
+    }
+
+    found = [rows[row_id] for row_id in ids if row_id in rows]
+    missing = [row_id for row_id in ids if row_id not in rows]
+
+    return found, missing
@@ -1,8 +1,185 @@
 import re
+import unicodedata
+from itertools import islice
+from typing import Iterable
+
+# Joins a batch into one string so each step runs once per batch. The
+# spaces around it turn a space left at an item's edge into a double
+# space, which the same pass that collapses inner runs then removes.
+SEPARATOR = ' \x00 '
+SPACES = re.compile(b' +')
+
+
+class TextNormalizer:
+    """Lowercases text, keeps letters, digits and the `keep` characters,
+    and collapses whitespace to single spaces.
+
+    With `fold`, text is also NFKD-folded and casefolded, so
+    'Memórias Póstumas' and 'MEMORIAS  POSTUMAS' give the same result.
+
+    Latin-1 text, which is nearly the whole catalog, goes through a
+    precomputed 256-byte table with `bytes.translate`. Anything else
+    falls back to a per-code-point table that fills itself lazily.
+    """
+
+    def __init__(self, *, fold: bool = False, keep: str = ''):
+        self.fold = fold
+        self.keep = frozenset(keep)
+        self._table = _CodePointTable(self._map_character)
+        self._byte_table, self._byte_deletes, self._byte_unsafe = (
+            self._build_byte_table()
+        )
+
+    def __call__(self, text: str) -> str:
+        return self._normalize_one(text)
+
+    def many(
+        self, texts: Iterable[str], batch_size: int = 10_000
+    ) -> list[str]:
+        results = []
+        texts = iter(texts)
+
+        while batch := list(islice(texts, batch_size)):
+            results.extend(self._normalize_batch(batch))
+
+        return results
+
+    def _map_character(self, character: str) -> str:
+        if character.isspace():
+            return ' '
+
+        if not self.fold:
+            lowered = character.lower()
+            if all(
+                part.isalnum()
+                or part in self.keep
+                or unicodedata.combining(part)
+                for part in lowered
+            ):
+                return lowered
+            return ''
+
+        parts = []
+        for part in unicodedata.normalize('NFKD', character.casefold()):
+            if part.isspace():
+                parts.append(' ')
+            elif part.isalnum() or part in self.keep:
+                parts.append(part)
+        return ''.join(parts)
+
+    def _build_byte_table(self) -> tuple[bytes, bytes, bytes]:
+        table, deletes, unsafe = (
+            bytearray(range(256)),
+            bytearray(),
+            bytearray(),
+        )
+
+        for byte in range(1, 256):
+            mapped = self._map_character(chr(byte))
+            if not mapped:
+                deletes.append(byte)
+            elif len(mapped) == 1 and ord(mapped) < 256:  # noqa: PLR2004
+                table[byte] = ord(mapped)
+            else:
+                unsafe.append(byte)
+
+        return bytes(table), bytes(deletes), bytes(unsafe)
+
+    def _normalize_one(self, text: str) -> str:
+        text = unicodedata.normalize('NFC', text)
+
+        encoded = self._encode(text)
+        if encoded is None:
+            return ' '.join(text.translate(self._table).split())
+
+        # NUL only survives the byte table to mark batch boundaries
+        encoded = encoded.translate(self._byte_table, self._byte_deletes)
+        return b' '.join(encoded.replace(b'\x00', b'').split()).decode(
+            'latin-1'
+        )
+
+    def _encode(self, text: str) -> bytes | None:
+        try:
+            encoded = text.encode('latin-1')
+        except UnicodeEncodeError:
+            return None
+
+        if any(byte in encoded for byte in self._byte_unsafe):
+            return None
+        return encoded
+
+    def _normalize_batch(self, batch: list[str]) -> list[str]:
+        joined = unicodedata.normalize(
+            'NFC', SEPARATOR.join(map(str.strip, batch))
+        )
+
+        encoded = self._encode(joined)
+        if encoded is None or encoded.count(0) != len(batch) - 1:
+            return self._bisect(batch)
+
+        encoded = encoded.translate(self._byte_table, self._byte_deletes)
+        encoded = _collapse_spaces(encoded)
+
+        results = encoded.strip(b' ').decode('latin-1').split(SEPARATOR)
+        # Texts that normalize to '' leave two separators sharing a space
+        if len(results) != len(batch):
+            return self._bisect(batch)
+
+        return results
+
+    def _bisect(self, batch: list[str]) -> list[str]:
+        # Narrow down to the texts the byte table can't handle instead of
+        # giving up on the whole batch
+        if len(batch) == 1:
+            return [self._normalize_one(batch[0])]
+
+        middle = len(batch) // 2
+        return self._normalize_batch(batch[:middle]) + self._normalize_batch(
+            batch[middle:]
+        )
+
+
+def _collapse_spaces(data: bytes) -> bytes:
+    # Runs are rare once texts are stripped, so patch them with find()
+    # instead of rewriting the whole batch
+    pieces, start = [], 0
+
+    while (run := data.find(b'  ', start)) != -1:
+        pieces.append(data[start : run + 1])
+        start = SPACES.match(data, run).end()
+
+    if not pieces:
+        return data
+
+    pieces.append(data[start:])
+    return b''.join(pieces)
+
+
+class _CodePointTable(dict):
+    def __init__(self, map_character):
+        super().__init__()
+        self._map_character = map_character
+
+    def __missing__(self, code_point: int):
+        self[code_point] = self._map_character(chr(code_point)) or None
+        return self[code_point]
+
+
+_display = TextNormalizer()
+_lookup = TextNormalizer(fold=True)
 
 
 def normalize_text(text: str):
-    text_normalized = ' '.join(text.split()).strip().lower()
-    text_cleaned = re.sub(r'[^a-zA-A\s]', '', text_normalized)
+    return _display(text)
+
+
+def normalize_many(texts: Iterable[str]) -> list[str]:
+    return _display.many(texts)
+
+
+def lookup_key(text: str):
+    return _lookup(text)
+
 
-    return text_cleaned
+def lookup_keys(texts: Iterable[str]) -> list[str]:
+    return _lookup.many(texts)
@@ -0,0 +1,60 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from mader_project.schemas import PageParams
+from mader_project.settings import Settings
+
+settings = Settings()  # type: ignore
+
+
+def encode_cursor(last_id: int) -> str:
+    return urlsafe_b64encode(str(last_id).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor!'
+        )
+
+
+def page_limit(page: PageParams) -> int:
+    return min(
+        page.limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX
+    )
+
+
+def page_window(
+    query: Select, id_column: InstrumentedAttribute[int], page: PageParams
+) -> Select:
+    if page.cursor:
+        query = query.where(id_column > decode_cursor(page.cursor))
+
+    return query.order_by(id_column).limit(page_limit(page) + 1)
+
+
+async def paginate(
+    query: Select,
+    id_column: InstrumentedAttribute[int],
+    page: PageParams,
+    session: AsyncSession,
+):
+    """Keyset pagination: seeks past the cursor id instead of OFFSET,
+    so every page is one index range scan of `limit + 1` rows."""
+    limit = page_limit(page)
+
+    rows = (await session.scalars(page_window(query, id_column, page))).all()
+
+    next_cursor = (
+        encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    )
+
+    return rows[:limit], next_cursor
@@ -0,0 +1,96 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import Double, and_, cast, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mader_project.models import Book, Novelist
+
+LIKE_ESCAPE = '\\'
+SEARCH_CONFIG = 'simple'
+
+
+def contains_pattern(term: str) -> str:
+    # User-typed % and _ would match anything and leave pg_trgm with no
+    # trigrams to look up, turning the index scan into a full scan.
+    escaped = (
+        term
+        .replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace('%', f'{LIKE_ESCAPE}%')
+        .replace('_', f'{LIKE_ESCAPE}_')
+    )
+    return f'%{escaped}%'
+
+
+def encode_search_cursor(rank: float, book_id: int) -> str:
+    return urlsafe_b64encode(json.dumps([rank, book_id]).encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        rank, book_id = json.loads(urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(book_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor!'
+        )
+
+
+async def search_books(
+    terms: str, limit: int, cursor: str | None, session: AsyncSession
+):
+    """Rank books whose title or novelist name matches `terms`.
+
+    Keyset-paginated on (rank desc, id) so later pages stay as cheap as
+    the first one.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, terms)
+    matches = (
+        select(
+            Book.id,
+            # real doesn't survive the cursor round trip exactly; double does
+            cast(func.ts_rank(Book.search_vector, query), Double).label(
+                'rank'
+            ),
+        )
+        .where(Book.search_vector.bool_op('@@')(query))
+        .subquery()
+    )
+
+    statement = (
+        select(
+            Book.id,
+            Book.id_novelist,
+            Book.title,
+            Book.year,
+            Novelist.name.label('novelist'),
+            matches.c.rank,
+        )
+        .join(matches, matches.c.id == Book.id)
+        .join(Novelist, Novelist.id == Book.id_novelist)
+    )
+
+    if cursor:
+        last_rank, last_id = decode_search_cursor(cursor)
+        statement = statement.where(
+            or_(
+                matches.c.rank < last_rank,
+                and_(matches.c.rank == last_rank, Book.id > last_id),
+            )
+        )
+
+    rows = (
+        await session.execute(
+            statement.order_by(matches.c.rank.desc(), Book.id).limit(limit + 1)
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_search_cursor(last.rank, last.id)
+
+    return rows[:limit], next_cursor
@@ -0,0 +1,124 @@
+import asyncio
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from time import perf_counter
+
+from fastapi import HTTPException
+
+from mader_project.security import get_password_hash, verify_password
+from mader_project.settings import Settings
+
+settings = Settings()  # type: ignore
+
+
+@dataclass
+class HasherMetrics:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    pending: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+
+
+class PasswordHasher:
+    """Runs Argon2 hashing on a worker pool so it never blocks the loop.
+
+    `max_workers` bounds how many hashes run at once and `max_pending`
+    bounds how many may be queued or running; past that, callers get a
+    503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, executor: str, max_workers: int, max_pending: int):
+        self.executor_kind = executor
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.metrics = HasherMetrics()
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            verify_password, plain_password, hashed_password
+        )
+
+    def stats(self) -> dict:
+        return asdict(self.metrics)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        self._semaphore = None
+        self._loop = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == 'process':
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix='password-hasher'
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives are bound to the loop that first waits on them
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        if self.metrics.pending >= self.max_pending:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail='Server busy, try again later!',
+            )
+
+        self.metrics.submitted += 1
+        self.metrics.pending += 1
+        queued_at = perf_counter()
+
+        try:
+            async with self._get_semaphore():
+                started_at = perf_counter()
+                self.metrics.wait_seconds += started_at - queued_at
+                self.metrics.in_flight += 1
+
+                try:
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        self._get_executor(), func, *args
+                    )
+                except Exception:
+                    self.metrics.failed += 1
+                    raise
+                finally:
+                    self.metrics.in_flight -= 1
+                    self.metrics.run_seconds += perf_counter() - started_at
+
+            self.metrics.completed += 1
+            return result
+
+        finally:
+            self.metrics.pending -= 1
+
+
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASHER_EXECUTOR,
+    max_workers=settings.PASSWORD_HASHER_MAX_WORKERS,
+    max_pending=settings.PASSWORD_HASHER_MAX_PENDING,
+)
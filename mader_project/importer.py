@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import csv
+import json
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from typing import Iterator, Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from mader_project import database
+from mader_project.functions.normalize_text import (
+    lookup_keys,
+    normalize_many,
+)
+from mader_project.response_cache import response_cache
+
+ImportKind = Literal['novelists', 'books']
+
+STAGING_TABLES = {
+    'novelists': (
+        'CREATE TEMP TABLE IF NOT EXISTS import_novelists '
+        '(name text, name_key text) ON COMMIT DELETE ROWS'
+    ),
+    'books': (
+        'CREATE TEMP TABLE IF NOT EXISTS import_books '
+        '(title text, title_key text, year integer, novelist_key text) '
+        'ON COMMIT DELETE ROWS'
+    ),
+}
+
+COPY_STATEMENTS = {
+    'novelists': 'COPY import_novelists (name, name_key) FROM STDIN',
+    'books': (
+        'COPY import_books (title, title_key, year, novelist_key) FROM STDIN'
+    ),
+}
+
+MERGE_STATEMENTS = {
+    'novelists': """
+        INSERT INTO novelists (name, name_key)
+        SELECT DISTINCT ON (s.name_key) s.name, s.name_key
+        FROM import_novelists s
+        ORDER BY s.name_key
+        ON CONFLICT (name_key) DO NOTHING
+    """,
+    'books': """
+        INSERT INTO books (title, title_key, year, id_novelist)
+        SELECT DISTINCT ON (s.title_key) s.title, s.title_key, s.year, n.id
+        FROM import_books s
+        JOIN novelists n ON n.name_key = s.novelist_key
+        ORDER BY s.title_key, n.id
+        ON CONFLICT (title_key) DO NOTHING
+    """,
+}
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    rows_inserted: int = 0
+    chunks_done: int = 0
+    chunks_skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+
+def read_records(path: Path) -> Iterator[dict]:
+    with path.open(encoding='utf-8', newline='') as file:
+        if path.suffix == '.csv':
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def chunked(records: Iterator[dict], size: int) -> Iterator[tuple]:
+    while chunk := tuple(islice(records, size)):
+        yield chunk
+
+
+def to_staging_rows(kind: ImportKind, records: tuple[dict, ...]) -> list:
+    if kind == 'novelists':
+        names = normalize_many(record['name'] for record in records)
+        return list(zip(names, lookup_keys(names)))
+
+    titles = normalize_many(record['title'] for record in records)
+    return list(
+        zip(
+            titles,
+            lookup_keys(titles),
+            (int(record['year']) for record in records),
+            lookup_keys(record['novelist'] for record in records),
+        )
+    )
+
+
+def read_checkpoint(checkpoint: Path | None) -> int:
+    if checkpoint is None or not checkpoint.exists():
+        return 0
+    return int(checkpoint.read_text() or 0)
+
+
+async def load_chunk(conn: AsyncConnection, kind: ImportKind, records) -> int:
+    raw_connection = await conn.get_raw_connection()
+
+    async with conn.begin():
+        await conn.execute(text(STAGING_TABLES[kind]))
+
+        async with raw_connection.driver_connection.cursor() as cursor:
+            async with cursor.copy(COPY_STATEMENTS[kind]) as copy:
+                for row in to_staging_rows(kind, records):
+                    await copy.write_row(row)
+
+        merged = await conn.execute(text(MERGE_STATEMENTS[kind]))
+
+    return merged.rowcount
+
+
+async def import_file(
+    engine: AsyncEngine,
+    kind: ImportKind,
+    path: Path,
+    *,
+    chunk_size: int = 10_000,
+    checkpoint: Path | None = None,
+) -> ImportReport:
+    """Load `path` through COPY into a temp staging table, one
+    transaction per chunk, then merge into the real table.
+
+    The number of committed chunks is written to `checkpoint`, so a run
+    that dies mid-file resumes at the chunk that failed. Merges are
+    idempotent, so replaying a chunk never duplicates rows.
+    """
+    report = ImportReport()
+    resume_from = read_checkpoint(checkpoint)
+    started_at = perf_counter()
+
+    async with engine.connect() as conn:
+        chunks = chunked(read_records(path), chunk_size)
+
+        for index, records in enumerate(chunks, start=1):
+            if index <= resume_from:
+                report.chunks_skipped += 1
+                continue
+
+            chunk_started_at = perf_counter()
+            inserted = await load_chunk(conn, kind, records)
+
+            if checkpoint is not None:
+                checkpoint.write_text(str(index))
+
+            report.rows_read += len(records)
+            report.rows_inserted += inserted
+            report.chunks_done += 1
+
+            elapsed = perf_counter() - chunk_started_at
+            print(
+                f'chunk {index}: {len(records)} rows, {inserted} inserted, '
+                f'{len(records) / elapsed:,.0f} rows/s'
+            )
+
+    if report.rows_inserted and response_cache.shared:
+        await response_cache.bump(kind)
+    elif report.rows_inserted:
+        # A per-process cache lives in the API workers, out of reach here
+        print(
+            f'warning: the response cache is not shared, cached {kind} '
+            f'pages may miss the new rows for up to '
+            f'{response_cache.ttl:g}s'
+        )
+
+    report.seconds = perf_counter() - started_at
+    print(
+        f'done: {report.rows_read} rows read, '
+        f'{report.rows_inserted} inserted, '
+        f'{report.rows_per_second:,.0f} rows/s'
+    )
+
+    return report
+
+
+async def main():  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        description='Bulk import novelists or books from CSV/NDJSON.'
+    )
+    parser.add_argument('kind', choices=['novelists', 'books'])
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--checkpoint', type=Path)
+    args = parser.parse_args()
+
+    await import_file(
+        database.engine,
+        args.kind,
+        args.path,
+        chunk_size=args.chunk_size,
+        checkpoint=args.checkpoint,
+    )
+    await database.engine.dispose()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    asyncio.run(main())
@@ -1,20 +1,43 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import DDL, BigInteger, ForeignKey, Index, event, func, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
 
+from mader_project.functions.normalize_text import lookup_key
+
 table_registry = registry()
 
+# The trigram indexes below need pg_trgm; migrations create it as well
+event.listen(
+    table_registry.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'),
+)
+
+
+def lookup_key_of(column: str):
+    # Fills title_key/name_key on single-row INSERTs (ORM or Core); multi-row
+    # inserts and UPDATEs of the source column pass the key themselves
+    def default(context):
+        return lookup_key(context.get_current_parameters()[column])
+
+    return default
+
 
 @table_registry.mapped_as_dataclass
 class Read_Books_Association:
     __tablename__ = 'read_books_association'
 
+    # Pure links: the database drops them with either side, so deletes
+    # never go through the ORM collections (see passive_deletes below)
     user_id: Mapped[int] = mapped_column(
-        ForeignKey('users.id'), primary_key=True
+        ForeignKey('users.id', ondelete='CASCADE'), primary_key=True
     )
     book_id: Mapped[int] = mapped_column(
-        ForeignKey('books.id'), primary_key=True
+        ForeignKey('books.id', ondelete='CASCADE'),
+        primary_key=True,
+        index=True,
     )
 
 
@@ -31,6 +54,7 @@ class User:
         secondary='read_books_association',
         back_populates='read_by_users',
         init=False,
+        passive_deletes=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -43,27 +67,59 @@ class User:
 @table_registry.mapped_as_dataclass
 class Novelist:
     __tablename__ = 'novelists'
+    __table_args__ = (
+        Index(
+            'ix_novelists_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+        Index('ix_novelists_name_key', 'name_key', unique=True),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     name: Mapped[str]
+    name_key: Mapped[str] = mapped_column(
+        init=False, insert_default=lookup_key_of('name')
+    )
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+    # The database deletes a novelist's books with it (ON DELETE CASCADE),
+    # so the ORM never loads them first
     books: Mapped[list['Book']] = relationship(
-        init=False, back_populates='novelist'
+        init=False, back_populates='novelist', passive_deletes=True
     )
 
 
 @table_registry.mapped_as_dataclass
 class Book:
     __tablename__ = 'books'
+    __table_args__ = (
+        Index(
+            'ix_books_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+        Index('ix_books_year', 'year'),
+        Index('ix_books_title_key', 'title_key', unique=True),
+        Index(
+            'ix_books_search_vector', 'search_vector', postgresql_using='gin'
+        ),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
-    id_novelist: Mapped[int] = mapped_column(ForeignKey('novelists.id'))
-    title: Mapped[str] = mapped_column(unique=True)
+    id_novelist: Mapped[int] = mapped_column(
+        ForeignKey('novelists.id', ondelete='CASCADE'), index=True
+    )
+    title: Mapped[str]
+    title_key: Mapped[str] = mapped_column(
+        init=False, insert_default=lookup_key_of('title')
+    )
     year: Mapped[int]
     novelist: Mapped[Novelist] = relationship(
         init=False, back_populates='books'
@@ -72,6 +128,7 @@ class Book:
         secondary='read_books_association',
         back_populates='read_books',
         init=False,
+        passive_deletes=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -79,3 +136,175 @@ class Book:
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+    # Maintained by the triggers below: title (weight A) plus the
+    # novelist's name (weight B). Deferred so plain reads never fetch it.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, init=False, deferred=True, nullable=True
+    )
+
+
+SEARCH_VECTOR_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION books_search_vector_update() RETURNS trigger
+    AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(
+                (SELECT name FROM novelists WHERE id = NEW.id_novelist), ''
+            )), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER books_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, id_novelist ON books
+    FOR EACH ROW EXECUTE FUNCTION books_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION novelists_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        UPDATE books
+        SET search_vector =
+            setweight(to_tsvector('simple', title), 'A')
+            || setweight(to_tsvector('simple', NEW.name), 'B')
+        WHERE id_novelist = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER novelists_search_vector_trigger
+    AFTER UPDATE OF name ON novelists
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION novelists_search_vector_update()
+    """,
+]
+
+for statement in SEARCH_VECTOR_DDL:
+    event.listen(Book.__table__, 'after_create', DDL(statement))
+
+
+@table_registry.mapped_as_dataclass
+class ChangeLog:
+    """One row per inserted, updated or deleted catalog row, written by
+    the triggers below. `txid` orders the feed; see read_changes."""
+
+    __tablename__ = 'change_log'
+    __table_args__ = (Index('ix_change_log_txid_id', 'txid', 'id'),)
+
+    id: Mapped[int] = mapped_column(BigInteger, init=False, primary_key=True)
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        init=False,
+        server_default=text('pg_current_xact_id()::text::bigint'),
+    )
+    table_name: Mapped[str]
+    operation: Mapped[str]
+    row_data: Mapped[dict] = mapped_column(JSONB)
+    changed_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+
+
+CHANGE_LOG_FUNCTIONS = [
+    # Statement-level, over the transition table, so bulk inserts and
+    # imports log in one INSERT ... SELECT instead of a call per row
+    """
+    CREATE OR REPLACE FUNCTION change_log_record_rows() RETURNS trigger
+    AS $$
+    BEGIN
+        INSERT INTO change_log (table_name, operation, row_data)
+        SELECT TG_TABLE_NAME, lower(TG_OP),
+               to_jsonb(r) - 'search_vector' - 'title_key' - 'name_key'
+        FROM changed_rows r;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # Transition tables can't be combined with UPDATE OF, which keeps
+    # search_vector and lookup-key rewrites out of the log
+    """
+    CREATE OR REPLACE FUNCTION change_log_record_row() RETURNS trigger
+    AS $$
+    BEGIN
+        INSERT INTO change_log (table_name, operation, row_data)
+        VALUES (
+            TG_TABLE_NAME, lower(TG_OP),
+            to_jsonb(NEW) - 'search_vector' - 'title_key' - 'name_key'
+        );
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # One notification per table and operation per statement, so a bulk
+    # import wakes the SSE listeners once instead of once per row
+    """
+    CREATE OR REPLACE FUNCTION change_log_notify() RETURNS trigger
+    AS $$
+    BEGIN
+        PERFORM pg_notify('catalog_changes', json_build_object(
+            'table', table_name, 'operation', operation, 'count', count(*)
+        )::text)
+        FROM new_changes
+        GROUP BY table_name, operation;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+CHANGE_LOG_NOTIFY_TRIGGER = """
+    CREATE TRIGGER change_log_notify
+    AFTER INSERT ON change_log
+    REFERENCING NEW TABLE AS new_changes
+    FOR EACH STATEMENT EXECUTE FUNCTION change_log_notify()
+"""
+
+# Columns whose updates reach the feed; insert/delete-only tables have none
+CHANGE_LOG_TABLES = {
+    'novelists': ('name',),
+    'books': ('title', 'year', 'id_novelist'),
+    'read_books_association': (),
+}
+
+
+def change_log_triggers(table: str, columns: tuple[str, ...]) -> list[str]:
+    statements = [
+        f"""
+        CREATE TRIGGER {table}_change_log_{operation}
+        AFTER {operation.upper()} ON {table}
+        REFERENCING {rows} TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION change_log_record_rows()
+        """
+        for operation, rows in (('insert', 'NEW'), ('delete', 'OLD'))
+    ]
+
+    if columns:
+        old = ', '.join(f'OLD.{column}' for column in columns)
+        new = ', '.join(f'NEW.{column}' for column in columns)
+        statements.append(f"""
+        CREATE TRIGGER {table}_change_log_update
+        AFTER UPDATE OF {', '.join(columns)} ON {table}
+        FOR EACH ROW WHEN (ROW({old}) IS DISTINCT FROM ROW({new}))
+        EXECUTE FUNCTION change_log_record_row()
+        """)
+
+    return statements
+
+
+for statement in CHANGE_LOG_FUNCTIONS:
+    event.listen(table_registry.metadata, 'before_create', DDL(statement))
+
+event.listen(
+    ChangeLog.__table__, 'after_create', DDL(CHANGE_LOG_NOTIFY_TRIGGER)
+)
+
+for table in table_registry.metadata.sorted_tables:
+    if table.name in CHANGE_LOG_TABLES:
+        for statement in change_log_triggers(
+            table.name, CHANGE_LOG_TABLES[table.name]
+        ):
+            event.listen(table, 'after_create', DDL(statement))
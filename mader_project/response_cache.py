@@ -0,0 +1,386 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from http import HTTPStatus
+from typing import Awaitable, Callable
+from urllib.parse import unquote, urlencode, urlsplit
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from mader_project.functions.conditional import Validators
+from mader_project.settings import Settings
+
+settings = Settings()  # type: ignore
+
+
+class CacheBackendError(Exception):
+    pass
+
+
+class MemoryBackend:
+    """LRU of response bodies bounded by entry count and total bytes.
+
+    Process-local like TTLCache: a write bumps the versions of the worker
+    that served it only, so the TTL bounds staleness on the others.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._discard(key)
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if len(key) + len(value) > self.max_bytes:
+            return
+
+        self._discard(key)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self.bytes += len(key) + len(value)
+
+        while (
+            len(self._data) > self.max_entries or self.bytes > self.max_bytes
+        ):
+            self._discard(next(iter(self._data)))
+            self.evictions += 1
+
+    async def get_versions(self, tables: tuple[str, ...]) -> list[int]:
+        return [self._versions.get(table, 0) for table in tables]
+
+    async def bump_version(self, table: str):
+        self._versions[table] = self._versions.get(table, 0) + 1
+
+    async def clear(self):
+        self._data.clear()
+        self._versions.clear()
+        self.bytes = 0
+        self.evictions = 0
+
+    async def stats(self) -> dict:
+        return {
+            'entries': len(self._data),
+            'bytes': self.bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+        }
+
+    async def close(self):
+        pass
+
+    def _discard(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= len(key) + len(entry[1])
+
+
+class RedisBackend:
+    """Speaks the Redis protocol (RESP2) over one connection per event
+    loop, so any Redis-compatible server works without a client library.
+
+    Versions live on the server, so a bump is seen by every worker at
+    once. Size limits are the server's own (`maxmemory`); the cache
+    should own its database, since `clear` flushes it.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or 'localhost'
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.strip('/') or 0)
+        self.timeout = timeout
+        self._connection = None
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.execute('GET', key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.execute('SET', key, value, 'PX', int(ttl * 1000))
+
+    async def get_versions(self, tables: tuple[str, ...]) -> list[int]:
+        versions = await self.execute(
+            'MGET', *(f'version:{table}' for table in tables)
+        )
+        return [int(version or 0) for version in versions]
+
+    async def bump_version(self, table: str):
+        await self.execute('INCR', f'version:{table}')
+
+    async def clear(self):
+        await self.execute('FLUSHDB')
+
+    async def stats(self) -> dict:
+        info = dict(
+            line.split(':', 1)
+            for line in (await self.execute('INFO', 'memory'))
+            .decode()
+            .splitlines()
+            if ':' in line
+        )
+        return {
+            'entries': await self.execute('DBSIZE'),
+            'bytes': int(info.get('used_memory', 0)),
+            'max_entries': None,
+            'max_bytes': int(info.get('maxmemory', 0)) or None,
+            'evictions': None,
+        }
+
+    async def close(self):
+        if self._connection is not None:
+            self._connection[1].close()
+        self._connection = None
+
+    async def execute(self, *args):
+        async with self._get_lock():
+            try:
+                return await asyncio.wait_for(
+                    self._round_trip(args), self.timeout
+                )
+            except (OSError, EOFError, asyncio.TimeoutError) as exc:
+                await self.close()
+                raise CacheBackendError(str(exc) or repr(exc)) from exc
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Connections, like asyncio primitives, belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+            self._connection = None
+        return self._lock
+
+    async def _round_trip(self, args):
+        if self._connection is None:
+            self._connection = await asyncio.open_connection(
+                self.host, self.port
+            )
+            if self.password:
+                await self._send(('AUTH', self.password))
+            if self.db:
+                await self._send(('SELECT', self.db))
+
+        return await self._send(args)
+
+    async def _send(self, args):
+        reader, writer = self._connection  # type: ignore
+        writer.write(encode_command(args))
+        await writer.drain()
+        return await read_reply(reader)
+
+
+CacheBackend = MemoryBackend | RedisBackend
+
+
+def encode_command(args) -> bytes:
+    parts = [f'*{len(args)}\r\n'.encode()]
+    for arg in args:
+        value = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(f'${len(value)}\r\n'.encode() + value + b'\r\n')
+    return b''.join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    line = await reader.readuntil(b'\r\n')
+    kind, payload = line[:1], line[1:-2]
+
+    if kind == b'+':
+        return payload.decode()
+    if kind == b'-':
+        raise CacheBackendError(payload.decode())
+    if kind == b':':
+        return int(payload)
+    if kind == b'$':
+        if int(payload) < 0:
+            return None
+        return (await reader.readexactly(int(payload) + 2))[:-2]
+    if kind == b'*':
+        if int(payload) < 0:
+            return None
+        return [await read_reply(reader) for _ in range(int(payload))]
+
+    raise CacheBackendError(f'Unexpected reply: {line!r}')
+
+
+class ResponseCache:
+    """Caches serialized JSON bodies of catalog reads.
+
+    Keys embed the current version of every table a response reads, so
+    writes invalidate by bumping a counter instead of finding keys.
+    Entries under an old version are never read again and age out.
+    Backend failures degrade to uncached responses.
+    """
+
+    def __init__(
+        self, backend: CacheBackend | None, ttl: float, max_entry_bytes: int
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def respond(
+        self,
+        request: Request,
+        tables: tuple[str, ...],
+        schema: type[BaseModel],
+        load: Callable[[], Awaitable],
+        validate: Callable[[], Awaitable[Validators | None]] | None = None,
+    ) -> Response:
+        """Serves `load` as JSON, answering conditional requests.
+
+        Entries keep the validators they were served with, so a hit is
+        answered, 304 included, without touching the database. On a miss
+        `validate` runs first, and a 304 skips loading altogether.
+
+        Bodies read from a replica (see get_read_session) are served but
+        not stored: it may not have replayed the writes behind the
+        versions in the key yet, and the entry would reach writers pinned
+        to the primary too. Routes load through CachedReadSession, which
+        stays on the primary while a backend is configured.
+        """
+        key = await self._key(request, tables)
+        entry = await self._call('get', key) if key else None
+
+        body = None
+        if entry is not None:
+            self.hits += 1
+            validators, body = decode_entry(entry)
+        else:
+            self.misses += 1
+            validators = await validate() if validate else None
+
+        if validators is not None and validators.not_modified(request):
+            return Response(
+                status_code=HTTPStatus.NOT_MODIFIED,
+                headers=validators.headers(),
+            )
+
+        if body is None:
+            body = (
+                schema
+                .model_validate(await load(), from_attributes=True)
+                .model_dump_json()
+                .encode()
+            )
+            entry = encode_entry(validators, body)
+            store = not getattr(request.state, 'replica_read', False)
+            if store and key and len(entry) <= self.max_entry_bytes:
+                await self._call('set', key, entry, self.ttl)
+
+        return Response(
+            content=body,
+            media_type='application/json',
+            headers=validators and validators.headers(),
+        )
+
+    @property
+    def shared(self) -> bool:
+        # Whether a bump here reaches the cache other processes serve from
+        return isinstance(self.backend, RedisBackend)
+
+    async def bump(self, *tables: str):
+        for table in tables:
+            await self._call('bump_version', table)
+
+    async def clear(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        await self._call('clear')
+
+    async def close(self):
+        await self._call('close')
+
+    async def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'errors': self.errors,
+            'max_entry_bytes': self.max_entry_bytes,
+            **(await self._call('stats') or {}),
+        }
+
+    async def _key(self, request: Request, tables: tuple[str, ...]):
+        # Read before the validators: a write landing in between bumps
+        # these versions, leaving whatever is cached under them unread
+        versions = await self._call('get_versions', tables)
+        if versions is None:
+            return None
+
+        query = urlencode(sorted(request.query_params.multi_items()))
+        tags = ','.join(f'{t}.{v}' for t, v in zip(tables, versions))
+        return f'response:{request.url.path}?{query}@{tags}'
+
+    async def _call(self, method: str, *args):
+        if self.backend is None:
+            return None
+
+        try:
+            return await getattr(self.backend, method)(*args)
+        except CacheBackendError:
+            self.errors += 1
+            return None
+
+
+def encode_entry(validators: Validators | None, body: bytes) -> bytes:
+    header = validators and [
+        validators.etag,
+        validators.last_modified and validators.last_modified.isoformat(),
+    ]
+    return json.dumps(header).encode() + b'\n' + body
+
+
+def decode_entry(entry: bytes) -> tuple[Validators | None, bytes]:
+    header, _, body = entry.partition(b'\n')
+    fields = json.loads(header)
+    if fields is None:
+        return None, body
+
+    etag, last_modified = fields
+    return Validators(
+        etag, last_modified and datetime.fromisoformat(last_modified)
+    ), body
+
+
+def build_backend() -> CacheBackend | None:
+    if settings.RESPONSE_CACHE_BACKEND == 'redis':
+        return RedisBackend(settings.RESPONSE_CACHE_REDIS_URL)
+    if settings.RESPONSE_CACHE_BACKEND == 'memory':
+        return MemoryBackend(
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+        )
+    return None
+
+
+response_cache = ResponseCache(
+    backend=build_backend(),
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_entry_bytes=settings.RESPONSE_CACHE_MAX_ENTRY_BYTES,
+)
@@ -4,9 +4,10 @@ from fastapi import APIRouter, HTTPException
 from sqlalchemy import select
 
 from mader_project.dependencies import CurrentUser, OAuthForm, Session
+from mader_project.hashing import password_hasher
 from mader_project.models import User
 from mader_project.schemas import Token
-from mader_project.security import create_access_token, verify_password
+from mader_project.security import create_access_token
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
@@ -23,7 +24,7 @@ async def login_for_access_token(form_data: OAuthForm, session: Session):
             detail='Incorrect Email or Password!',
         )
 
-    if not verify_password(form_data.password, user_db.password):
+    if not await password_hasher.verify(form_data.password, user_db.password):
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Incorrect Email or Password!',
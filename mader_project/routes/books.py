@@ -1,24 +1,53 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Request
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
 
-from mader_project.dependencies import CurrentUser, Session
+from mader_project.dependencies import (
+    CachedReadSession,
+    CurrentUser,
+    LookupIds,
+    Pagination,
+    ReadSession,
+    Session,
+)
+from mader_project.functions.conditional import (
+    page_validators,
+    row_validators,
+)
 from mader_project.functions.func_books_utils import (
     verify_existing_book_by_id,
-    verify_existing_book_by_title,
 )
-from mader_project.functions.normalize_text import normalize_text
+from mader_project.functions.func_novelists_utils import (
+    existing_novelist_ids,
+)
+from mader_project.functions.integrity import translate_integrity_errors
+from mader_project.functions.lookup import lookup_by_ids
+from mader_project.functions.normalize_text import (
+    lookup_key,
+    lookup_keys,
+    normalize_many,
+    normalize_text,
+)
+from mader_project.functions.pagination import paginate
+from mader_project.functions.search import LIKE_ESCAPE, contains_pattern
 from mader_project.models import Book
+from mader_project.response_cache import response_cache
 from mader_project.schemas import (
+    BookBatch,
+    BookBatchResult,
     BookCreation,
     BookList,
+    BookLookup,
     BookSchema,
     BookUpdate,
     Message,
 )
+from mader_project.settings import Settings
 
 router = APIRouter(prefix='/books', tags=['books'])
+settings = Settings()  # type: ignore
 
 
 @router.post(
@@ -27,42 +56,132 @@ router = APIRouter(prefix='/books', tags=['books'])
 async def create_book(
     book: BookCreation, session: Session, current_user: CurrentUser
 ):
-    await verify_existing_book_by_title(book.title, session)
-
     book_title = normalize_text(book.title)
 
-    new_book = Book(
-        title=book_title, year=book.year, id_novelist=book.id_novelist
+    async with translate_integrity_errors(session):
+        new_book = await session.scalar(
+            insert(Book)
+            .values(
+                title=book_title, year=book.year, id_novelist=book.id_novelist
+            )
+            .returning(Book)
+        )
+        await session.commit()
+
+    await response_cache.bump('books')
+    return new_book
+
+
+@router.post(
+    '/bulk-create', status_code=HTTPStatus.OK, response_model=BookBatchResult
+)
+async def bulk_create_books(
+    batch: BookBatch, session: Session, current_user: CurrentUser
+):
+    if len(batch.books) > settings.BULK_CREATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail='Too many books in one batch!',
+        )
+
+    novelist_ids = await existing_novelist_ids(
+        {book.id_novelist for book in batch.books}, session
     )
 
-    session.add(new_book)
-    await session.commit()
-    await session.refresh(new_book)
+    titles = normalize_many(book.title for book in batch.books)
+
+    results = []
+    rows_by_key = {}
+    for book, title, title_key in zip(
+        batch.books, titles, lookup_keys(titles)
+    ):
+        if book.id_novelist not in novelist_ids:
+            results.append({'title': title, 'status': 'invalid'})
+        elif title_key in rows_by_key:
+            results.append({'title': title, 'status': 'duplicate'})
+        else:
+            rows_by_key[title_key] = book.model_dump() | {
+                'title': title,
+                'title_key': title_key,
+            }
+            results.append({'title': title, 'status': 'created'})
+
+    created_ids = {}
+    if rows_by_key:
+        created = await session.execute(
+            insert(Book)
+            .values(list(rows_by_key.values()))
+            .on_conflict_do_nothing(index_elements=[Book.title_key])
+            .returning(Book.id, Book.title_key)
+        )
+        created_ids = {title_key: book_id for book_id, title_key in created}
+        await session.commit()
+
+    if created_ids:
+        await response_cache.bump('books')
+
+    for result in results:
+        if result['status'] != 'created':
+            continue
+        if (title_key := lookup_key(result['title'])) in created_ids:
+            result['id'] = created_ids[title_key]
+        else:
+            result['status'] = 'duplicate'
+
+    return {'results': results}
 
-    return new_book
+
+@router.get('', response_model=BookLookup, status_code=HTTPStatus.OK)
+async def get_books_by_ids(
+    ids: LookupIds, session: ReadSession, current_user: CurrentUser
+):
+    books_db, missing = await lookup_by_ids(
+        select(Book), Book.id, ids, session
+    )
+
+    return {'books': books_db, 'missing': missing}
 
 
 @router.get(
     '/list-all-books', response_model=BookList, status_code=HTTPStatus.OK
 )
-async def get_all_books(session: Session, current_user: CurrentUser):
-    books_db = (await session.scalars(select(Book))).all()
-
-    if not books_db:
-        return {'books': []}
+async def get_all_books(
+    request: Request,
+    session: CachedReadSession,
+    current_user: CurrentUser,
+    page: Pagination,
+):
+    async def load():
+        books_db, next_cursor = await paginate(
+            select(Book), Book.id, page, session
+        )
+        return {'books': books_db, 'next_cursor': next_cursor}
 
-    return {'books': books_db}
+    return await response_cache.respond(
+        request,
+        ('books',),
+        BookList,
+        load,
+        lambda: page_validators(select(Book), Book.id, page, session),
+    )
 
 
 @router.get(
     '/get-book/{book_id}', response_model=BookSchema, status_code=HTTPStatus.OK
 )
 async def get_book_by_id(
-    book_id: int, session: Session, current_user: CurrentUser
+    book_id: int,
+    request: Request,
+    session: CachedReadSession,
+    current_user: CurrentUser,
 ):
-    book_db = await verify_existing_book_by_id(book_id, session)
-
-    return book_db
+    return await response_cache.respond(
+        request,
+        ('books',),
+        BookSchema,
+        lambda: verify_existing_book_by_id(book_id, session),
+        lambda: row_validators(Book, book_id, session),
+    )
 
 
 @router.get(
@@ -71,11 +190,11 @@ async def get_book_by_id(
     response_model=BookList,
 )
 async def list_books_by_year(
-    title: str, year: int, session: Session, current_user: CurrentUser
+    title: str, year: int, session: ReadSession, current_user: CurrentUser
 ):
     query = (
         select(Book)
-        .where(Book.title.ilike(f'%{title}%'))
+        .where(Book.title.ilike(contains_pattern(title), escape=LIKE_ESCAPE))
         .where(Book.year == year)
     )
 
@@ -93,10 +212,17 @@ async def list_books_by_year(
 async def delete_book_by_id(
     book_id: int, session: Session, current_user: CurrentUser
 ):
-    book_db = await verify_existing_book_by_id(book_id, session)
+    deleted_id = await session.scalar(
+        delete(Book).where(Book.id == book_id).returning(Book.id)
+    )
+
+    if not deleted_id:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Book not found!'
+        )
 
-    await session.delete(book_db)
     await session.commit()
+    await response_cache.bump('books')
 
     return {'message': 'Book deleted!'}
 
@@ -112,14 +238,31 @@ async def update_book(
     current_user: CurrentUser,
     book: BookUpdate,
 ):
-    book_db = await verify_existing_book_by_id(book_id, session)
+    values = {
+        key: normalize_text(value) if key == 'title' else value
+        for key, value in book.model_dump(exclude_unset=True).items()
+    }
+
+    if not values:
+        return await verify_existing_book_by_id(book_id, session)
+
+    if 'title' in values:
+        values['title_key'] = lookup_key(values['title'])
+
+    async with translate_integrity_errors(session):
+        book_db = await session.scalar(
+            update(Book)
+            .where(Book.id == book_id)
+            .values(values)
+            .returning(Book)
+        )
 
-    for key, value in book.model_dump(exclude_unset=True).items():
-        final_value = normalize_text(value) if key == 'title' else value
-        setattr(book_db, key, final_value)
+    if not book_db:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Book not found!'
+        )
 
-    session.add(book_db)
     await session.commit()
-    await session.refresh(book_db)
+    await response_cache.bump('books')
 
     return book_db
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from mader_project.change_stream import (
+    OVERFLOW,
+    Subscription,
+    change_listener,
+)
+from mader_project.dependencies import CurrentUser, Session, StreamUser
+from mader_project.functions.changes import read_changes
+from mader_project.functions.pagination import page_limit
+from mader_project.schemas import ChangeFeed, PageParams, Token
+from mader_project.security import STREAM_SCOPE, create_access_token
+from mader_project.settings import Settings
+
+router = APIRouter(prefix='/changes', tags=['changes'])
+settings = Settings()  # type: ignore
+
+
+@router.get('', response_model=ChangeFeed, status_code=HTTPStatus.OK)
+async def get_changes(
+    session: Session,
+    current_user: CurrentUser,
+    since: str | None = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+):
+    changes, next_cursor, has_more = await read_changes(
+        since, page_limit(PageParams(limit=limit)), session
+    )
+
+    return {
+        'changes': changes,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    }
+
+
+async def stream_events(subscription: Subscription):
+    while True:
+        try:
+            event = await subscription.get(
+                settings.CHANGE_STREAM_KEEPALIVE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            # Keeps proxies from closing an idle stream
+            yield ': keep-alive\n\n'
+            continue
+
+        if event is None:
+            return
+        yield event.encode()
+
+        # A dropped subscriber gets nothing after OVERFLOW; closing the
+        # stream lets EventSource reconnect and resync from /changes
+        if event == OVERFLOW:
+            return
+
+
+@router.post(
+    '/stream-token', response_model=Token, status_code=HTTPStatus.CREATED
+)
+async def create_stream_token(current_user: CurrentUser):
+    """A token for `/changes/stream?token=`, valid for
+    CHANGE_STREAM_TOKEN_SECONDS and rejected by every other route."""
+    stream_token = create_access_token(
+        data={'sub': current_user.email, 'scope': STREAM_SCOPE},
+        expires_in=timedelta(seconds=settings.CHANGE_STREAM_TOKEN_SECONDS),
+    )
+
+    return {'access_token': stream_token, 'token_type': 'Bearer'}
+
+
+@router.get('/stream', status_code=HTTPStatus.OK)
+async def stream_changes(current_user: StreamUser):
+    """Server-Sent Events: a `change` event per table and operation of
+    each committed statement. Clients fetch the rows from /changes, and
+    resync there after an `overflow` or `reset` event.
+
+    Takes the usual bearer header or, for EventSource, a token from
+    /changes/stream-token as `?token=`. The token is only checked when
+    the stream opens, so an EventSource reconnecting after it expired
+    gets 401 and has to be recreated with a fresh one."""
+    subscription = await change_listener.subscribe()
+
+    return StreamingResponse(
+        stream_events(subscription),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        # Runs however the stream ends, client disconnects included
+        background=BackgroundTask(change_listener.unsubscribe, subscription),
+    )
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from mader_project.dependencies import CurrentUser, Session
+from mader_project.functions.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    stream_export,
+)
+from mader_project.models import Book, Novelist
+from mader_project.schemas import BookSchema, NovelistAllInfoSchema
+from mader_project.settings import Settings
+
+router = APIRouter(prefix='/export', tags=['export'])
+settings = Settings()  # type: ignore
+
+
+@router.get('/books', status_code=HTTPStatus.OK)
+async def export_books(
+    session: Session,
+    current_user: CurrentUser,
+    format: ExportFormat = 'ndjson',
+):
+    rows = stream_export(
+        select(Book).order_by(Book.id),
+        BookSchema,
+        format,
+        settings.EXPORT_FETCH_SIZE,
+        session,
+    )
+
+    return StreamingResponse(rows, media_type=MEDIA_TYPES[format])
+
+
+@router.get('/novelists', status_code=HTTPStatus.OK)
+async def export_novelists(
+    session: Session,
+    current_user: CurrentUser,
+    format: ExportFormat = 'ndjson',
+):
+    rows = stream_export(
+        select(Novelist).order_by(Novelist.id),
+        NovelistAllInfoSchema,
+        format,
+        settings.EXPORT_FETCH_SIZE,
+        session,
+    )
+
+    return StreamingResponse(rows, media_type=MEDIA_TYPES[format])
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+
+from mader_project.change_stream import change_listener
+from mader_project.database import engine
+from mader_project.hashing import password_hasher
+from mader_project.response_cache import response_cache
+from mader_project.schemas import (
+    CacheStats,
+    ChangeStreamStats,
+    DatabasePoolStats,
+    PasswordHasherStats,
+    ResponseCacheStats,
+)
+from mader_project.security import (
+    get_current_user,
+    principal_cache,
+    token_cache,
+)
+
+# Queue depths, cache sizes and pool pressure are for operators only
+router = APIRouter(
+    prefix='/metrics',
+    tags=['metrics'],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@router.get(
+    '/password-hasher',
+    response_model=PasswordHasherStats,
+    status_code=HTTPStatus.OK,
+)
+async def get_password_hasher_stats():
+    return password_hasher.stats()
+
+
+@router.get(
+    '/principal-cache', response_model=CacheStats, status_code=HTTPStatus.OK
+)
+async def get_principal_cache_stats():
+    return principal_cache.stats()
+
+
+@router.get(
+    '/token-cache', response_model=CacheStats, status_code=HTTPStatus.OK
+)
+async def get_token_cache_stats():
+    return token_cache.stats()
+
+
+@router.get(
+    '/response-cache',
+    response_model=ResponseCacheStats,
+    status_code=HTTPStatus.OK,
+)
+async def get_response_cache_stats():
+    return await response_cache.stats()
+
+
+@router.get(
+    '/change-stream',
+    response_model=ChangeStreamStats,
+    status_code=HTTPStatus.OK,
+)
+async def get_change_stream_stats():
+    return change_listener.stats()
+
+
+@router.get(
+    '/database-pool',
+    response_model=DatabasePoolStats,
+    status_code=HTTPStatus.OK,
+)
+async def get_database_pool_stats():
+    return engine.pool.stats()  # type: ignore
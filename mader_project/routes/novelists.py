@@ -1,16 +1,42 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter
-from sqlalchemy import select
-
-from mader_project.dependencies import CurrentUser, Session
+from fastapi import APIRouter, HTTPException, Request
+from sqlalchemy import delete, insert, select, update
+
+from mader_project.dependencies import (
+    CachedReadSession,
+    CurrentUser,
+    LookupIds,
+    Pagination,
+    ReadSession,
+    Session,
+)
+from mader_project.functions.conditional import (
+    page_validators,
+    row_validators,
+)
 from mader_project.functions.func_novelists_utils import (
     verify_existing_novelist_by_id,
-    verify_existing_novelist_by_name,
+    with_books,
 )
-from mader_project.functions.normalize_text import normalize_text
+from mader_project.functions.integrity import translate_integrity_errors
+from mader_project.functions.lookup import lookup_by_ids
+from mader_project.functions.normalize_text import (
+    lookup_key,
+    normalize_text,
+)
+from mader_project.functions.pagination import paginate
+from mader_project.functions.search import LIKE_ESCAPE, contains_pattern
 from mader_project.models import Novelist
-from mader_project.schemas import Message, NoveLists, NovelistSchema
+from mader_project.response_cache import response_cache
+from mader_project.schemas import (
+    Message,
+    NovelistLookup,
+    NoveLists,
+    NovelistSchema,
+    NovelistsWithBooks,
+    NovelistWithBooks,
+)
 
 router = APIRouter(prefix='/novelists', tags=['novelists'])
 
@@ -23,25 +49,67 @@ router = APIRouter(prefix='/novelists', tags=['novelists'])
 async def create_novelist(
     novelist: NovelistSchema, session: Session, current_user: CurrentUser
 ):
-    await verify_existing_novelist_by_name(novelist.name, session)
-
     novelist_name = normalize_text(novelist.name)
 
-    new_novelist = Novelist(name=novelist_name)
-
-    session.add(new_novelist)
-    await session.commit()
-    await session.refresh(new_novelist)
+    async with translate_integrity_errors(session):
+        new_novelist = await session.scalar(
+            insert(Novelist).values(name=novelist_name).returning(Novelist)
+        )
+        await session.commit()
 
+    await response_cache.bump('novelists')
     return new_novelist
 
 
+@router.get('', response_model=NovelistLookup, status_code=HTTPStatus.OK)
+async def get_novelists_by_ids(
+    ids: LookupIds, session: ReadSession, current_user: CurrentUser
+):
+    novelists_db, missing = await lookup_by_ids(
+        select(Novelist), Novelist.id, ids, session
+    )
+
+    return {'novelists': novelists_db, 'missing': missing}
+
+
+@router.get(
+    '/with-books', response_model=NovelistsWithBooks, status_code=HTTPStatus.OK
+)
+async def get_novelists_with_books(
+    ids: LookupIds, session: ReadSession, current_user: CurrentUser
+):
+    novelists_db, missing = await lookup_by_ids(
+        select(Novelist), Novelist.id, ids, session
+    )
+
+    return {
+        'novelists': await with_books(novelists_db, session),
+        'missing': missing,
+    }
+
+
 @router.get(
     '/list-novelists', response_model=NoveLists, status_code=HTTPStatus.OK
 )
-async def get_all_novelists(session: Session, current_user: CurrentUser):
-    novelists_db = (await session.scalars(select(Novelist))).all()
-    return {'novelists': novelists_db}
+async def get_all_novelists(
+    request: Request,
+    session: CachedReadSession,
+    current_user: CurrentUser,
+    page: Pagination,
+):
+    async def load():
+        novelists_db, next_cursor = await paginate(
+            select(Novelist), Novelist.id, page, session
+        )
+        return {'novelists': novelists_db, 'next_cursor': next_cursor}
+
+    return await response_cache.respond(
+        request,
+        ('novelists',),
+        NoveLists,
+        load,
+        lambda: page_validators(select(Novelist), Novelist.id, page, session),
+    )
 
 
 @router.get(
@@ -50,23 +118,52 @@ async def get_all_novelists(session: Session, current_user: CurrentUser):
     response_model=NoveLists,
 )
 async def get_novelists_by_filter_name(
-    name: str, session: Session, current_user: CurrentUser
+    name: str,
+    session: ReadSession,
+    current_user: CurrentUser,
+    page: Pagination,
 ):
-    query = select(Novelist).where(Novelist.name.ilike(f'%{name}%'))
+    query = select(Novelist).where(
+        Novelist.name.ilike(contains_pattern(name), escape=LIKE_ESCAPE)
+    )
 
-    novelists_db = (await session.scalars((query))).all()
-    return {'novelists': novelists_db}
+    novelists_db, next_cursor = await paginate(
+        query, Novelist.id, page, session
+    )
+    return {'novelists': novelists_db, 'next_cursor': next_cursor}
 
 
 @router.get(
     '/novelist/{id}', response_model=NovelistSchema, status_code=HTTPStatus.OK
 )
 async def get_novelist_by_id(
-    id: int, session: Session, current_user: CurrentUser
+    id: int,
+    request: Request,
+    session: CachedReadSession,
+    current_user: CurrentUser,
+):
+    return await response_cache.respond(
+        request,
+        ('novelists',),
+        NovelistSchema,
+        lambda: verify_existing_novelist_by_id(id, session),
+        lambda: row_validators(Novelist, id, session),
+    )
+
+
+@router.get(
+    '/novelist/{id}/with-books',
+    response_model=NovelistWithBooks,
+    status_code=HTTPStatus.OK,
+)
+async def get_novelist_with_books(
+    id: int, session: ReadSession, current_user: CurrentUser
 ):
     novelist_db = await verify_existing_novelist_by_id(id, session)
 
-    return novelist_db
+    [novelist] = await with_books([novelist_db], session)
+
+    return novelist
 
 
 @router.put(
@@ -80,14 +177,23 @@ async def edit_novelist_by_id(
     session: Session,
     current_user: CurrentUser,
 ):
-    novelist_db = await verify_existing_novelist_by_id(id, session)
     novelist_name = normalize_text(novelist.name)
-    await verify_existing_novelist_by_name(novelist.name, session)
 
-    novelist_db.name = novelist_name
+    async with translate_integrity_errors(session):
+        novelist_db = await session.scalar(
+            update(Novelist)
+            .where(Novelist.id == id)
+            .values(name=novelist_name, name_key=lookup_key(novelist_name))
+            .returning(Novelist)
+        )
+
+    if not novelist_db:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Novelist not found!'
+        )
 
     await session.commit()
-    await session.refresh(novelist_db)
+    await response_cache.bump('novelists')
 
     return novelist_db
 
@@ -100,9 +206,17 @@ async def delete_novelist_by_id(
     session: Session,
     current_user: CurrentUser,
 ):
-    novelist_db = await verify_existing_novelist_by_id(id, session)
+    # Cascades to the novelist's books and their read-list links
+    deleted_id = await session.scalar(
+        delete(Novelist).where(Novelist.id == id).returning(Novelist.id)
+    )
+
+    if not deleted_id:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Novelist not found!'
+        )
 
-    await session.delete(novelist_db)
     await session.commit()
+    await response_cache.bump('novelists', 'books')
 
     return {'message': 'Novelist deleted!'}
@@ -0,0 +1,25 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from mader_project.dependencies import CurrentUser, Pagination, Session
+from mader_project.functions.pagination import page_limit
+from mader_project.functions.search import search_books
+from mader_project.schemas import SearchResults
+
+router = APIRouter(prefix='/search', tags=['search'])
+
+
+@router.get('', response_model=SearchResults, status_code=HTTPStatus.OK)
+async def search_catalog(
+    q: Annotated[str, Query(min_length=1)],
+    session: Session,
+    current_user: CurrentUser,
+    page: Pagination,
+):
+    results, next_cursor = await search_books(
+        q, page_limit(page), page.cursor, session
+    )
+
+    return {'results': results, 'next_cursor': next_cursor}
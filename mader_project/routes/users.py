@@ -1,26 +1,39 @@
 from http import HTTPStatus
 
 from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
 
-from mader_project.dependencies import CurrentUser, Session
-from mader_project.functions.func_books_utils import verify_existing_book_by_id
+from mader_project.dependencies import (
+    CurrentUser,
+    LookupIds,
+    Pagination,
+    ReadSession,
+    Session,
+)
 from mader_project.functions.func_users_utils import (
+    add_read_books,
+    expand_users,
     verify_existing_user_by_id,
-    verify_existing_user_by_name_and_email,
     verify_similar_user_id,
 )
-from mader_project.models import User
+from mader_project.functions.integrity import translate_integrity_errors
+from mader_project.functions.lookup import lookup_by_ids
+from mader_project.functions.pagination import paginate
+from mader_project.hashing import password_hasher
+from mader_project.models import Book, Read_Books_Association, User
 from mader_project.schemas import (
+    BookList,
     Message,
+    ReadBooks,
+    UserExpand,
     UserList,
+    UserLookup,
     UserPublic,
     UserPublicBooks,
     UserSchema,
 )
-from mader_project.security import get_password_hash
+from mader_project.security import invalidate_principal
 
 router = APIRouter(prefix='/users', tags=['users'])
 
@@ -31,17 +44,15 @@ router = APIRouter(prefix='/users', tags=['users'])
     response_model=UserPublic,
 )
 async def create_user(user: UserSchema, session: Session):
-    await verify_existing_user_by_name_and_email(user, session)
-
-    user_db = User(
-        name=user.name,
-        email=user.email,
-        password=get_password_hash(user.password),
-    )
+    hashed_password = await password_hasher.hash(user.password)
 
-    session.add(user_db)
-    await session.commit()
-    await session.refresh(user_db)
+    async with translate_integrity_errors(session):
+        user_db = await session.scalar(
+            insert(User)
+            .values(name=user.name, email=user.email, password=hashed_password)
+            .returning(User)
+        )
+        await session.commit()
 
     return user_db
 
@@ -49,16 +60,37 @@ async def create_user(user: UserSchema, session: Session):
 @router.get(
     '/list-all-users', response_model=UserList, status_code=HTTPStatus.OK
 )
-async def list_all_users(session: Session, current_user: CurrentUser):
-    users_db = (
-        await session.scalars(
-            select(User)
-            .where(User.status)
-            .options(selectinload(User.read_books))
-        )
-    ).all()
+async def list_all_users(
+    session: ReadSession,
+    current_user: CurrentUser,
+    page: Pagination,
+    expand: UserExpand | None = None,
+):
+    users_db, next_cursor = await paginate(
+        select(User).where(User.status), User.id, page, session
+    )
+
+    return {
+        'users': await expand_users(users_db, expand, session),
+        'next_cursor': next_cursor,
+    }
+
+
+@router.get('', response_model=UserLookup, status_code=HTTPStatus.OK)
+async def get_users_by_ids(
+    ids: LookupIds,
+    session: ReadSession,
+    current_user: CurrentUser,
+    expand: UserExpand | None = None,
+):
+    users_db, missing = await lookup_by_ids(
+        select(User).where(User.status), User.id, ids, session
+    )
 
-    return {'users': users_db}
+    return {
+        'users': await expand_users(users_db, expand, session),
+        'missing': missing,
+    }
 
 
 @router.get(
@@ -67,11 +99,42 @@ async def list_all_users(session: Session, current_user: CurrentUser):
     status_code=HTTPStatus.OK,
 )
 async def get_user_by_id(
-    user_id: int, session: Session, current_user: CurrentUser
+    user_id: int,
+    session: ReadSession,
+    current_user: CurrentUser,
+    expand: UserExpand | None = None,
 ):
     user_db = await verify_existing_user_by_id(user_id, session)
 
-    return user_db
+    [user] = await expand_users([user_db], expand, session)
+
+    return user
+
+
+@router.get(
+    '/{user_id}/read-books',
+    response_model=BookList,
+    status_code=HTTPStatus.OK,
+)
+async def list_read_books(
+    user_id: int,
+    session: ReadSession,
+    current_user: CurrentUser,
+    page: Pagination,
+):
+    await verify_existing_user_by_id(user_id, session)
+
+    query = (
+        select(Book)
+        .join(
+            Read_Books_Association, Read_Books_Association.book_id == Book.id
+        )
+        .where(Read_Books_Association.user_id == user_id)
+    )
+
+    books_db, next_cursor = await paginate(query, Book.id, page, session)
+
+    return {'books': books_db, 'next_cursor': next_cursor}
 
 
 @router.put(
@@ -83,19 +146,22 @@ async def get_user_by_id(
 async def edit_user_by_id(
     user_id: int, user: UserSchema, session: Session, current_user: CurrentUser
 ):
-    await verify_existing_user_by_id(user_id, session)
-
+    # Checked first so no one can spend hasher slots on other users
     verify_similar_user_id(current_user.id, user_id)
 
+    # Ends the transaction a principal lookup may have begun, so no
+    # connection is held while the hasher runs
+    await session.commit()
+    hashed_password = await password_hasher.hash(user.password)
+
+    user_db = await verify_existing_user_by_id(user_id, session)
+
     try:
-        current_user.name = user.name
-        current_user.email = user.email
-        current_user.password = get_password_hash(user.password)
+        user_db.name = user.name
+        user_db.email = user.email
+        user_db.password = hashed_password
 
         await session.commit()
-        await session.refresh(current_user)
-
-        return current_user
 
     except IntegrityError:
         raise HTTPException(
@@ -103,6 +169,11 @@ async def edit_user_by_id(
             detail='Username or Email already exists!',
         )
 
+    await session.refresh(user_db)
+    invalidate_principal(current_user.email)
+
+    return user_db
+
 
 @router.delete(
     '/delete-user/{user_id}',
@@ -113,13 +184,15 @@ async def edit_user_by_id(
 async def delete_user_by_id(
     user_id: int, session: Session, current_user: CurrentUser
 ):
-    await verify_existing_user_by_id(user_id, session)
+    user_db = await verify_existing_user_by_id(user_id, session)
 
     verify_similar_user_id(current_user.id, user_id)
 
-    await session.delete(current_user)
+    await session.delete(user_db)
     await session.commit()
 
+    invalidate_principal(current_user.email)
+
     return {'message': 'User deleted!'}
 
 
@@ -132,13 +205,23 @@ async def delete_user_by_id(
 async def books_read_by_user(
     book_id: int, session: Session, current_user: CurrentUser
 ):
-    book_db = await verify_existing_book_by_id(book_id, session)
+    await add_read_books(current_user.id, [book_id], session)
 
-    if book_db not in current_user.read_books:
-        current_user.read_books.append(book_db)
-
-        session.add(current_user)
-        await session.commit()
-        await session.refresh(current_user)
+    invalidate_principal(current_user.email)
 
     return {'message': 'Book added to the user book list!'}
+
+
+@router.post(
+    '/books-read',
+    status_code=HTTPStatus.CREATED,
+    response_model=Message,
+)
+async def many_books_read_by_user(
+    read_books: ReadBooks, session: Session, current_user: CurrentUser
+):
+    await add_read_books(current_user.id, read_books.book_ids, session)
+
+    invalidate_principal(current_user.email)
+
+    return {'message': 'Books added to the user book list!'}
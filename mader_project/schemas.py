@@ -1,10 +1,18 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class Message(BaseModel):
     message: str
 
 
+class PageParams(BaseModel):
+    limit: int | None = Field(default=None, ge=1)
+    cursor: str | None = None
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -25,6 +33,20 @@ class BookCreation(BaseModel):
     year: int
 
 
+class BookBatch(BaseModel):
+    books: list[BookCreation]
+
+
+class BookBatchItem(BaseModel):
+    title: str
+    status: Literal['created', 'duplicate', 'invalid']
+    id: int | None = None
+
+
+class BookBatchResult(BaseModel):
+    results: list[BookBatchItem]
+
+
 class BookUpdate(BaseModel):
     id_novelist: int | None = None
     title: str | None = None
@@ -33,6 +55,37 @@ class BookUpdate(BaseModel):
 
 class BookList(BaseModel):
     books: list[BookSchema]
+    next_cursor: str | None = None
+
+
+class BookLookup(BaseModel):
+    books: list[BookSchema]
+    missing: list[int]
+
+
+class SearchHit(BookSchema):
+    novelist: str
+    rank: float
+
+
+class SearchResults(BaseModel):
+    results: list[SearchHit]
+    next_cursor: str | None = None
+
+
+class Change(BaseModel):
+    table: str = Field(validation_alias='table_name')
+    operation: Literal['insert', 'update', 'delete']
+    data: dict = Field(validation_alias='row_data')
+    changed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangeFeed(BaseModel):
+    changes: list[Change]
+    next_cursor: str | None
+    has_more: bool
 
 
 class NovelistSchema(BaseModel):
@@ -48,6 +101,23 @@ class NovelistAllInfoSchema(BaseModel):
 
 class NoveLists(BaseModel):
     novelists: list[NovelistAllInfoSchema]
+    next_cursor: str | None = None
+
+
+class NovelistWithBooks(BaseModel):
+    id: int
+    name: str
+    books: list[BookSchema]
+
+
+class NovelistsWithBooks(BaseModel):
+    novelists: list[NovelistWithBooks]
+    missing: list[int]
+
+
+class NovelistLookup(BaseModel):
+    novelists: list[NovelistAllInfoSchema]
+    missing: list[int]
 
 
 class UserSchema(BaseModel):
@@ -56,6 +126,10 @@ class UserSchema(BaseModel):
     password: str
 
 
+class ReadBooks(BaseModel):
+    book_ids: list[int] = Field(min_length=1, max_length=1_000)
+
+
 class UserPublic(BaseModel):
     id: int
     name: str
@@ -64,14 +138,83 @@ class UserPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class Principal(BaseModel):
+    id: int
+    name: str
+    email: str
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+UserExpand = Literal['read_books']
+
+
 class UserPublicBooks(BaseModel):
     id: int
     name: str
     email: EmailStr
-    read_books: list[BookSchema]
+    read_books: list[BookSchema] | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class UserList(BaseModel):
     users: list[UserPublicBooks]
+    next_cursor: str | None = None
+
+
+class UserLookup(BaseModel):
+    users: list[UserPublicBooks]
+    missing: list[int]
+
+
+class PasswordHasherStats(BaseModel):
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    in_flight: int
+    pending: int
+    wait_seconds: float
+    run_seconds: float
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class ResponseCacheStats(BaseModel):
+    backend: str | None
+    hits: int
+    misses: int
+    hit_ratio: float
+    errors: int
+    max_entry_bytes: int
+    entries: int | None = None
+    bytes: int | None = None
+    max_entries: int | None = None
+    max_bytes: int | None = None
+    evictions: int | None = None
+
+
+class ChangeStreamStats(BaseModel):
+    subscribers: int
+    delivered: int
+    dropped: int
+    reconnects: int
+    listening: bool
+
+
+class DatabasePoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds: float
+    max_wait_seconds: float
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
+from hashlib import sha256
 from http import HTTPStatus
+from time import time
 from zoneinfo import ZoneInfo
 
 from fastapi import Depends, HTTPException
@@ -12,15 +14,29 @@ from jwt import (  # type: ignore
 )
 from pwdlib import PasswordHash  # type: ignore
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
+from mader_project.caching import TTLCache
 from mader_project.database import AsyncSession, get_session
 from mader_project.models import User
+from mader_project.schemas import Principal
 from mader_project.settings import Settings
 
 pwd_context = PasswordHash.recommended()
 settings = Settings()  # type: ignore
 oauth2_schema = OAuth2PasswordBearer(tokenUrl='auth/token')
+optional_oauth2_schema = OAuth2PasswordBearer(
+    tokenUrl='auth/token', auto_error=False
+)
+# Tokens only /changes/stream accepts, see get_stream_user
+STREAM_SCOPE = 'change-stream'
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
 
 
 def get_password_hash(password: str):
@@ -31,11 +47,11 @@ def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(data: dict):
+def create_access_token(data: dict, expires_in: timedelta | None = None):
     to_encode = data.copy()
 
-    expire = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
-        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    expire = datetime.now(tz=ZoneInfo('UTC')) + (
+        expires_in or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
 
     to_encode.update({'exp': expire})
@@ -47,36 +63,94 @@ def create_access_token(data: dict):
     return encode_jwt
 
 
-async def get_current_user(
-    session: AsyncSession = Depends(get_session),
-    token: str = Depends(oauth2_schema),
-):
-    credentials_exception = HTTPException(
+def decode_access_token(token: str) -> dict:
+    if not settings.TOKEN_CACHE_ENABLED:
+        return decode(
+            token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
+        )
+
+    # Keyed by digest so raw bearer tokens are never kept in memory
+    digest = sha256(token.encode()).digest()
+    payload = token_cache.get(digest)
+    if payload and payload['exp'] > time():
+        return payload
+
+    payload = decode(token, settings.SECRET_KEY, algorithms=settings.ALGORITHM)
+    if 'exp' in payload:
+        token_cache.set(digest, payload, ttl=payload['exp'] - time())
+
+    return payload
+
+
+def credentials_exception():
+    return HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
         headers={'WWW-Authenticate': 'Bearer'},
     )
 
+
+async def authenticate(
+    token: str, session: AsyncSession, scope: str | None = None
+) -> Principal:
     try:
-        payload = decode(
-            token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
-        )
+        payload = decode_access_token(token)
         subject_email = payload.get('sub')
-        if not subject_email:
-            raise credentials_exception
+        # Scoped tokens only work where that scope is asked for, and
+        # plain access tokens only where none is
+        if not subject_email or payload.get('scope') != scope:
+            raise credentials_exception()
 
     except DecodeError:
-        raise credentials_exception
+        raise credentials_exception()
     except ExpiredSignatureError:
-        raise credentials_exception
+        raise credentials_exception()
 
-    user = await session.scalar(
-        select(User)
-        .where(User.email == subject_email)
-        .options(selectinload(User.read_books))
-    )
+    principal = principal_cache.get(subject_email)
+    if not principal:
+        user_row = (
+            await session.execute(
+                select(User.id, User.name, User.email).where(
+                    User.email == subject_email
+                )
+            )
+        ).first()
+
+        if not user_row:
+            raise credentials_exception()
+
+        principal = Principal.model_validate(user_row)
+        principal_cache.set(subject_email, principal)
+
+    # Lets a commit on this session pin the user to the primary
+    session.info['principal_id'] = principal.id
+
+    return principal
+
+
+async def get_current_user(
+    session: AsyncSession = Depends(get_session),
+    token: str = Depends(oauth2_schema),
+):
+    return await authenticate(token, session)
+
+
+async def get_stream_user(
+    session: AsyncSession = Depends(get_session),
+    bearer: str | None = Depends(optional_oauth2_schema),
+    token: str | None = None,
+):
+    """Browser EventSource can't send an Authorization header, so the
+    stream also takes a short-lived stream token as `?token=`. Access
+    tokens are never read from the query string, where URLs end up in
+    logs and history."""
+    if bearer is not None:
+        return await authenticate(bearer, session)
+    if token is not None:
+        return await authenticate(token, session, scope=STREAM_SCOPE)
+
+    raise credentials_exception()
 
-    if not user:
-        raise credentials_exception
 
-    return user
+def invalidate_principal(email: str):
+    principal_cache.pop(email)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,3 +12,51 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30.0
+    # -1 keeps connections forever; set below any server or proxy idle
+    # timeout so the pool never hands out a connection that was cut
+    DATABASE_POOL_RECYCLE_SECONDS: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    # psycopg prepares a statement after this many runs; None disables
+    # prepared statements, as PgBouncer in transaction mode requires
+    DATABASE_PREPARE_THRESHOLD: int | None = 5
+
+    # GET routes read from here when set, see ReadSession
+    DATABASE_REPLICA_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    READ_YOUR_WRITES_MAX_USERS: int = 10_000
+
+    PASSWORD_HASHER_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASHER_MAX_WORKERS: int = 4
+    PASSWORD_HASHER_MAX_PENDING: int = 64
+
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
+
+    EXPORT_FETCH_SIZE: int = 1_000
+
+    BULK_CREATE_MAX_ITEMS: int = 1_000
+    BULK_LOOKUP_MAX_IDS: int = 100
+
+    READ_BOOKS_EXPAND_LIMIT: int = 20
+    NOVELIST_BOOKS_LIMIT: int = 20
+
+    RESPONSE_CACHE_BACKEND: Literal['memory', 'redis', 'off'] = 'memory'
+    RESPONSE_CACHE_REDIS_URL: str = 'redis://localhost:6379/0'
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10_000
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+
+    CHANGE_STREAM_QUEUE_SIZE: int = 100
+    CHANGE_STREAM_KEEPALIVE_SECONDS: float = 15.0
+    CHANGE_STREAM_TOKEN_SECONDS: int = 60
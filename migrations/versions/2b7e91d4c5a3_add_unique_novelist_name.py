@@ -0,0 +1,60 @@
+"""Add unique novelist name
+
+Revision ID: 2b7e91d4c5a3
+Revises: 8f3a6c0d21e7
+Create Date: 2026-10-18 16:02:37.190512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7e91d4c5a3'
+down_revision: Union[str, Sequence[str], None] = '8f3a6c0d21e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Two novelists can share a name. The oldest keeps it and later ones get
+# their id appended, as d4a8f1e6b372 does for lookup keys: no rows are
+# merged or deleted, and downgrade() restores the names. Stored names
+# are normalized, so they never contain '#' themselves.
+SUFFIX_DUPLICATES = """
+    UPDATE novelists SET name = name || ' #' || id
+    WHERE id NOT IN (SELECT min(id) FROM novelists GROUP BY name)
+"""
+
+STRIP_SUFFIXES = """
+    UPDATE novelists SET name = left(name, -length(' #' || id))
+    WHERE name LIKE ('% #' || id)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(SUFFIX_DUPLICATES)
+
+    # Build the index without blocking writes, then promote it in place
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'novelists_name_key',
+            'novelists',
+            ['name'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute(
+        'ALTER TABLE novelists ADD CONSTRAINT novelists_name_key '
+        'UNIQUE USING INDEX novelists_name_key'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('novelists_name_key', 'novelists', type_='unique')
+    op.execute(STRIP_SUFFIXES)
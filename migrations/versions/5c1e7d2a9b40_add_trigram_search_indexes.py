@@ -0,0 +1,74 @@
+"""Add trigram search indexes
+
+Revision ID: 5c1e7d2a9b40
+Revises: ab6afa01e231
+Create Date: 2026-10-18 13:40:12.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7d2a9b40'
+down_revision: Union[str, Sequence[str], None] = 'ab6afa01e231'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY keeps the catalog writable while large tables are indexed
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_books_title_trgm',
+            'books',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_novelists_name_trgm',
+            'novelists',
+            ['name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_books_year',
+            'books',
+            ['year'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_books_year',
+            table_name='books',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_novelists_name_trgm',
+            table_name='novelists',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_books_title_trgm',
+            table_name='books',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,121 @@
+"""Rekey lookup keys for unicode folding
+
+Revision ID: 6e0b5c9a4f18
+Revises: d4a8f1e6b372
+Create Date: 2026-10-18 19:48:52.603117
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e0b5c9a4f18'
+down_revision: Union[str, Sequence[str], None] = 'd4a8f1e6b372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5_000
+
+
+
+def lookup_key(text: str) -> str:
+    """Frozen copy of the app's lookup_key as of this revision: NFKD
+    folding and casefolding, letters and digits only, single spaces.
+    A plain per-character version of TextNormalizer(fold=True)."""
+    characters = []
+    for character in unicodedata.normalize('NFC', text):
+        if character.isspace():
+            characters.append(' ')
+            continue
+        for part in unicodedata.normalize('NFKD', character.casefold()):
+            if part.isspace():
+                characters.append(' ')
+            elif part.isalnum():
+                characters.append(part)
+    return ' '.join(''.join(characters).split())
+
+
+# (table, source column, key column)
+KEYS = [
+    ('books', 'title', 'title_key'),
+    ('novelists', 'name', 'name_key'),
+]
+
+
+def final_keys(table: str, column: str, key_column: str) -> dict:
+    """Every row's key under the new normalization, computed before any
+    is written. The oldest row of each key keeps it plain; later
+    duplicates get ' #<id>', as in d4a8f1e6b372. Returns only the rows
+    whose key changes."""
+    conn = op.get_bind()
+    select_batch = sa.text(
+        f'SELECT id, {column}, {key_column} FROM {table} '
+        'WHERE id > :last_id ORDER BY id LIMIT :batch_size'
+    )
+
+    taken: set[str] = set()
+    changed = {}
+    last_id = 0
+    while rows := conn.execute(
+        select_batch, {'last_id': last_id, 'batch_size': BATCH_SIZE}
+    ).all():
+        for row_id, value, current in rows:
+            key = lookup_key(value)
+            if key in taken:
+                key = f'{key} #{row_id}'
+            else:
+                taken.add(key)
+
+            if key != current:
+                changed[row_id] = key
+        last_id = rows[-1][0]
+
+    return changed
+
+
+def write_keys(table: str, key_column: str, changed: dict) -> None:
+    """Parks the changed rows on '#<id>' first. No key starts with '#',
+    so a row can then take a key another changed row is giving up
+    without tripping the unique index, whatever the batch order."""
+    conn = op.get_bind()
+    park_batch = sa.text(
+        f"UPDATE {table} SET {key_column} = '#' || id "
+        'WHERE id = ANY(CAST(:ids AS integer[]))'
+    )
+    update_batch = sa.text(
+        f'UPDATE {table} SET {key_column} = batch.key '
+        'FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS text[])) '
+        f'AS batch (id, key) WHERE {table}.id = batch.id'
+    )
+
+    ids = list(changed)
+    for start in range(0, len(ids), BATCH_SIZE):
+        conn.execute(park_batch, {'ids': ids[start : start + BATCH_SIZE]})
+
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start : start + BATCH_SIZE]
+        conn.execute(
+            update_batch,
+            {'ids': batch, 'keys': [changed[row_id] for row_id in batch]},
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One transaction: reads go on, but writes wait until the migration
+    # commits, so no insert can claim a key between computing the final
+    # keys and writing them
+    for table, column, key_column in KEYS:
+        op.execute(f'LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE')
+        write_keys(table, key_column, final_keys(table, column, key_column))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Keys are not reverted: the folded keys still satisfy the unique
+    # indexes the previous revision expects
+    pass
@@ -0,0 +1,101 @@
+"""Add books search vector
+
+Revision ID: 8f3a6c0d21e7
+Revises: 5c1e7d2a9b40
+Create Date: 2026-10-18 14:02:37.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a6c0d21e7'
+down_revision: Union[str, Sequence[str], None] = '5c1e7d2a9b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'books',
+        sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True),
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION books_search_vector_update() RETURNS trigger
+        AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(
+                    (SELECT name FROM novelists WHERE id = NEW.id_novelist), ''
+                )), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER books_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, id_novelist ON books
+        FOR EACH ROW EXECUTE FUNCTION books_search_vector_update()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION novelists_search_vector_update()
+        RETURNS trigger AS $$
+        BEGIN
+            UPDATE books
+            SET search_vector =
+                setweight(to_tsvector('simple', title), 'A')
+                || setweight(to_tsvector('simple', NEW.name), 'B')
+            WHERE id_novelist = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER novelists_search_vector_trigger
+        AFTER UPDATE OF name ON novelists
+        FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION novelists_search_vector_update()
+    """)
+
+    op.execute("""
+        UPDATE books
+        SET search_vector =
+            setweight(to_tsvector('simple', books.title), 'A')
+            || setweight(to_tsvector('simple', novelists.name), 'B')
+        FROM novelists
+        WHERE novelists.id = books.id_novelist
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_books_search_vector',
+            'books',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_books_search_vector',
+            table_name='books',
+            postgresql_concurrently=True,
+        )
+
+    op.execute('DROP TRIGGER novelists_search_vector_trigger ON novelists')
+    op.execute('DROP TRIGGER books_search_vector_trigger ON books')
+    op.execute('DROP FUNCTION novelists_search_vector_update()')
+    op.execute('DROP FUNCTION books_search_vector_update()')
+    op.drop_column('books', 'search_vector')
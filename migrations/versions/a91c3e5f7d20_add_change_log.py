@@ -0,0 +1,126 @@
+"""Add change log
+
+Revision ID: a91c3e5f7d20
+Revises: 6e0b5c9a4f18
+Create Date: 2026-10-18 21:16:05.284113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91c3e5f7d20'
+down_revision: Union[str, Sequence[str], None] = '6e0b5c9a4f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, columns whose updates are logged), parents before children so
+# the backfill replays in an order mirrors can apply
+TABLES = [
+    ('novelists', ('name',)),
+    ('books', ('title', 'year', 'id_novelist')),
+    ('read_books_association', ()),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'change_log',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'txid',
+            sa.BigInteger(),
+            server_default=sa.text('pg_current_xact_id()::text::bigint'),
+            nullable=False,
+        ),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('operation', sa.String(), nullable=False),
+        sa.Column(
+            'row_data', postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.Column(
+            'changed_at',
+            sa.DateTime(),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_change_log_txid_id', 'change_log', ['txid', 'id'], unique=False
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION change_log_record_rows() RETURNS trigger
+        AS $$
+        BEGIN
+            INSERT INTO change_log (table_name, operation, row_data)
+            SELECT TG_TABLE_NAME, lower(TG_OP),
+                   to_jsonb(r) - 'search_vector' - 'title_key' - 'name_key'
+            FROM changed_rows r;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION change_log_record_row() RETURNS trigger
+        AS $$
+        BEGIN
+            INSERT INTO change_log (table_name, operation, row_data)
+            VALUES (
+                TG_TABLE_NAME, lower(TG_OP),
+                to_jsonb(NEW) - 'search_vector' - 'title_key' - 'name_key'
+            );
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table, columns in TABLES:
+        for operation, rows in (('insert', 'NEW'), ('delete', 'OLD')):
+            op.execute(f"""
+                CREATE TRIGGER {table}_change_log_{operation}
+                AFTER {operation.upper()} ON {table}
+                REFERENCING {rows} TABLE AS changed_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION change_log_record_rows()
+            """)
+
+        if columns:
+            old = ', '.join(f'OLD.{column}' for column in columns)
+            new = ', '.join(f'NEW.{column}' for column in columns)
+            op.execute(f"""
+                CREATE TRIGGER {table}_change_log_update
+                AFTER UPDATE OF {', '.join(columns)} ON {table}
+                FOR EACH ROW WHEN (ROW({old}) IS DISTINCT FROM ROW({new}))
+                EXECUTE FUNCTION change_log_record_row()
+            """)
+
+    # Seed the log with the current catalog, so a new mirror can sync
+    # from the feed alone instead of pulling the list endpoints first
+    for table, _ in TABLES:
+        op.execute(f"""
+            INSERT INTO change_log (table_name, operation, row_data)
+            SELECT '{table}', 'insert',
+                   to_jsonb(r) - 'search_vector' - 'title_key' - 'name_key'
+            FROM {table} r
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in reversed(TABLES):
+        operations = ['insert', 'delete'] + (['update'] if columns else [])
+        for operation in operations:
+            op.execute(
+                f'DROP TRIGGER {table}_change_log_{operation} ON {table}'
+            )
+
+    op.execute('DROP FUNCTION change_log_record_row()')
+    op.execute('DROP FUNCTION change_log_record_rows()')
+    op.drop_index('ix_change_log_txid_id', table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,47 @@
+"""Notify catalog changes
+
+Revision ID: c3f27d9e81b4
+Revises: a91c3e5f7d20
+Create Date: 2026-10-18 22:03:41.907265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f27d9e81b4'
+down_revision: Union[str, Sequence[str], None] = 'a91c3e5f7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION change_log_notify() RETURNS trigger
+        AS $$
+        BEGIN
+            PERFORM pg_notify('catalog_changes', json_build_object(
+                'table', table_name, 'operation', operation, 'count', count(*)
+            )::text)
+            FROM new_changes
+            GROUP BY table_name, operation;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER change_log_notify
+        AFTER INSERT ON change_log
+        REFERENCING NEW TABLE AS new_changes
+        FOR EACH STATEMENT EXECUTE FUNCTION change_log_notify()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER change_log_notify ON change_log')
+    op.execute('DROP FUNCTION change_log_notify()')
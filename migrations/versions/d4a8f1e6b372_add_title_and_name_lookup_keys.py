@@ -0,0 +1,116 @@
+"""Add title and name lookup keys
+
+Revision ID: d4a8f1e6b372
+Revises: 2b7e91d4c5a3
+Create Date: 2026-10-18 17:21:05.864103
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f1e6b372'
+down_revision: Union[str, Sequence[str], None] = '2b7e91d4c5a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5_000
+
+
+
+def lookup_key(text: str) -> str:
+    # Frozen copy of the app's lookup_key as of this revision, so the
+    # keys it writes never change when the app's normalization does
+    text = re.sub(r'[^a-zA-A\s]', '', ' '.join(text.split()).strip().lower())
+    return ' '.join(text.split())
+
+
+# (table, source column, key column, unique constraint it replaces)
+KEYS = [
+    ('books', 'title', 'title_key', 'books_title_key'),
+    ('novelists', 'name', 'name_key', 'novelists_name_key'),
+]
+
+
+def backfill(table: str, column: str, key_column: str) -> None:
+    """Fill the key in id order, committing every BATCH_SIZE rows so the
+    backfill never holds long row locks on a large catalog."""
+    conn = op.get_bind()
+    select_batch = sa.text(
+        f'SELECT id, {column} FROM {table} '
+        'WHERE id > :last_id ORDER BY id LIMIT :batch_size'
+    )
+    update_batch = sa.text(
+        f'UPDATE {table} SET {key_column} = batch.key '
+        'FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS text[])) '
+        f'AS batch (id, key) WHERE {table}.id = batch.id'
+    )
+
+    last_id = 0
+    while rows := conn.execute(
+        select_batch, {'last_id': last_id, 'batch_size': BATCH_SIZE}
+    ).all():
+        conn.execute(
+            update_batch,
+            {
+                'ids': [row_id for row_id, _ in rows],
+                'keys': [lookup_key(value) for _, value in rows],
+            },
+        )
+        last_id = rows[-1][0]
+
+
+def suffix_duplicates(table: str, key_column: str) -> None:
+    # Older rows whose values differ only in ways the key folds away keep
+    # the plain key; the rest get their id appended so they stay reachable
+    op.execute(
+        f"""
+        UPDATE {table} SET {key_column} = {key_column} || ' #' || id
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY {key_column} ORDER BY id
+                ) AS position
+                FROM {table}
+            ) ranked
+            WHERE position > 1
+        )
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, _, key_column, _ in KEYS:
+        op.add_column(table, sa.Column(key_column, sa.String(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        for table, column, key_column, _ in KEYS:
+            backfill(table, column, key_column)
+            suffix_duplicates(table, key_column)
+
+        for table, _, key_column, _ in KEYS:
+            op.create_index(
+                f'ix_{table}_{key_column}',
+                table,
+                [key_column],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+    for table, _, key_column, constraint in KEYS:
+        op.alter_column(table, key_column, nullable=False)
+        op.drop_constraint(constraint, table, type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, key_column, constraint in KEYS:
+        op.create_unique_constraint(constraint, table, [column])
+        op.drop_index(f'ix_{table}_{key_column}', table_name=table)
+        op.drop_column(table, key_column)
@@ -0,0 +1,102 @@
+"""Index foreign keys and cascade deletes
+
+Revision ID: f5d2b8a7c6e1
+Revises: c3f27d9e81b4
+Create Date: 2026-10-18 23:12:37.560412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5d2b8a7c6e1'
+down_revision: Union[str, Sequence[str], None] = 'c3f27d9e81b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (constraint, table, column, referred table, ON DELETE rule)
+FOREIGN_KEYS = [
+    (
+        'books_id_novelist_fkey',
+        'books',
+        'id_novelist',
+        'novelists',
+        'CASCADE',
+    ),
+    (
+        'read_books_association_book_id_fkey',
+        'read_books_association',
+        'book_id',
+        'books',
+        'CASCADE',
+    ),
+    (
+        'read_books_association_user_id_fkey',
+        'read_books_association',
+        'user_id',
+        'users',
+        'CASCADE',
+    ),
+]
+
+
+def replace_foreign_keys(with_rules: bool) -> None:
+    # NOT VALID swaps each constraint under a brief lock; VALIDATE then
+    # scans existing rows without blocking writes
+    for name, table, column, referred, rule in FOREIGN_KEYS:
+        on_delete = f' ON DELETE {rule}' if with_rules else ''
+        op.execute(f"""
+            ALTER TABLE {table}
+                DROP CONSTRAINT {name},
+                ADD CONSTRAINT {name} FOREIGN KEY ({column})
+                    REFERENCES {referred} (id){on_delete} NOT VALID
+        """)
+
+    with op.get_context().autocommit_block():
+        for name, table, *_ in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Without these, every novelist or book delete scans the referencing
+    # table to check or cascade the foreign key
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_books_id_novelist',
+            'books',
+            ['id_novelist'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_read_books_association_book_id',
+            'read_books_association',
+            ['book_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    replace_foreign_keys(with_rules=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    replace_foreign_keys(with_rules=False)
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_read_books_association_book_id',
+            table_name='read_books_association',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_books_id_novelist',
+            table_name='books',
+            postgresql_concurrently=True,
+        )
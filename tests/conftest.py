@@ -10,10 +10,16 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import selectinload
 from testcontainers.postgres import PostgresContainer
 
+from mader_project import database
 from mader_project.app import app
 from mader_project.database import get_session
 from mader_project.models import Book, Novelist, User, table_registry
-from mader_project.security import get_password_hash
+from mader_project.response_cache import response_cache
+from mader_project.security import (
+    get_password_hash,
+    principal_cache,
+    token_cache,
+)
 from mader_project.settings import Settings
 
 
@@ -27,7 +33,12 @@ def client(session):
     def get_session_override():
         return session
 
+    principal_cache.clear()
+    token_cache.clear()
+    database.primary_pins.clear()
+
     with TestClient(app) as client:
+        client.portal.call(response_cache.clear)
         app.dependency_overrides[get_session] = get_session_override
         yield client
 
@@ -40,6 +51,26 @@ def engine():
         yield create_async_engine(postgres.get_connection_url())
 
 
+@pytest.fixture(scope='session')
+def replica_engine():
+    # A second, independent instance: rows only reach it when a test puts
+    # them there, so reads served from it are easy to tell apart
+    with PostgresContainer('postgres:17', driver='psycopg') as postgres:
+        yield create_async_engine(postgres.get_connection_url())
+
+
+@pytest_asyncio.fixture
+async def replica(replica_engine, monkeypatch):
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.create_all)
+
+    monkeypatch.setattr(database, 'replica_engine', replica_engine)
+    yield replica_engine
+
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(table_registry.metadata.drop_all)
+
+
 @pytest_asyncio.fixture
 async def session(engine):
     async with engine.begin() as conn:
@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+import pytest
+
+from mader_project.models import Book
 from mader_project.schemas import BookSchema
 
 
@@ -24,13 +27,23 @@ def test_create_book(client, token, book):
 
 
 def test_create_book_conflict_error(client, token, book):
+    client.post(
+        '/books/create-book',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'id_novelist': book.id_novelist,
+            'title': 'Dom Casmurro',
+            'year': 1899,
+        },
+    )
+
     response = client.post(
         '/books/create-book',
         headers={'Authorization': f'Bearer {token}'},
         json={
             'id_novelist': book.id_novelist,
-            'title': book.title,
-            'year': book.year,
+            'title': 'DOM  casmurro',
+            'year': 1899,
         },
     )
 
@@ -38,13 +51,24 @@ def test_create_book_conflict_error(client, token, book):
     assert response.json() == {'detail': 'Book already exists!'}
 
 
+def test_create_book_novelist_not_found(client, token):
+    response = client.post(
+        '/books/create-book',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'id_novelist': 999, 'title': 'orphan', 'year': 1997},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Novelist not found!'}
+
+
 def test_list_all_books_empty_list(client, token):
     response = client.get(
         '/books/list-all-books', headers={'Authorization': f'Bearer {token}'}
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'books': []}
+    assert response.json() == {'books': [], 'next_cursor': None}
 
 
 def test_list_all_books(client, token, book):
@@ -54,7 +78,7 @@ def test_list_all_books(client, token, book):
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'books': [book_schema]}
+    assert response.json() == {'books': [book_schema], 'next_cursor': None}
 
 
 def test_get_book_by_id(client, token, book):
@@ -76,7 +100,7 @@ def test_get_book_by_title_and_year(client, token, book):
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'books': [book_schema]}
+    assert response.json() == {'books': [book_schema], 'next_cursor': None}
 
 
 def test_get_book_by_title_and_year_empty_list(client, token, book):
@@ -86,7 +110,7 @@ def test_get_book_by_title_and_year_empty_list(client, token, book):
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'books': []}
+    assert response.json() == {'books': [], 'next_cursor': None}
 
 
 def test_delete_book_by_id(client, token, book):
@@ -108,3 +132,203 @@ def test_update_book_by_id(client, token, book):
 
     assert response.status_code == HTTPStatus.OK
     assert response.json()['title'] == 'harry potter'
+
+
+def test_update_book_by_id_conflict(client, token, book):
+    client.post(
+        '/books/create-book',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'id_novelist': book.id_novelist,
+            'title': 'iracema',
+            'year': 1865,
+        },
+    )
+
+    response = client.patch(
+        f'/books/update-book/{book.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'title': ' Iracema  '},
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'Book already exists!'}
+
+
+def test_list_all_books_paginated(client, token, novelist):
+    for title in ('dom casmurro', 'iracema', 'senhora'):
+        client.post(
+            '/books/create-book',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'id_novelist': novelist.id, 'title': title, 'year': 1900},
+        )
+
+    first_page = client.get(
+        '/books/list-all-books',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'limit': 2},
+    ).json()
+    second_page = client.get(
+        '/books/list-all-books',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'limit': 2, 'cursor': first_page['next_cursor']},
+    ).json()
+
+    assert [b['title'] for b in first_page['books']] == [
+        'dom casmurro',
+        'iracema',
+    ]
+    assert [b['title'] for b in second_page['books']] == ['senhora']
+    assert second_page['next_cursor'] is None
+
+
+def test_list_all_books_invalid_cursor(client, token):
+    response = client.get(
+        '/books/list-all-books',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'cursor': 'not-a-cursor'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor!'}
+
+
+def test_bulk_create_books(client, token, novelist):
+    client.post(
+        '/books/create-book',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'id_novelist': novelist.id, 'title': 'senhora', 'year': 1875},
+    )
+
+    response = client.post(
+        '/books/bulk-create',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'books': [
+                {'id_novelist': novelist.id, 'title': 'Iracema', 'year': 1865},
+                {'id_novelist': novelist.id, 'title': 'iracema', 'year': 1865},
+                {'id_novelist': novelist.id, 'title': 'Senhora', 'year': 1},
+                {'id_novelist': 99, 'title': 'luciola', 'year': 1862},
+            ]
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'results': [
+            {'title': 'iracema', 'status': 'created', 'id': 2},
+            {'title': 'iracema', 'status': 'duplicate', 'id': None},
+            {'title': 'senhora', 'status': 'duplicate', 'id': None},
+            {'title': 'luciola', 'status': 'invalid', 'id': None},
+        ]
+    }
+
+
+def test_bulk_create_books_too_many_items(client, token, settings):
+    books = [
+        {'id_novelist': 1, 'title': f'book {n}', 'year': 1}
+        for n in range(settings.BULK_CREATE_MAX_ITEMS + 1)
+    ]
+
+    response = client.post(
+        '/books/bulk-create',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'books': books},
+    )
+
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert response.json() == {'detail': 'Too many books in one batch!'}
+
+
+def test_get_book_by_title_and_year_wildcards_are_literal(client, token, book):
+    response = client.get(
+        f'/books/list-book/%25/{book.year}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'books': [], 'next_cursor': None}
+
+
+def test_delete_book_read_by_user(client, token, book):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post(f'/users/books-read/{book.id}', headers=headers)
+
+    response = client.delete(f'/books/delete-book/{book.id}', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Book deleted!'}
+
+
+def test_delete_book_by_id_not_found(client, token):
+    response = client.delete(
+        f'/books/delete-book/{99}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Book not found!'}
+
+
+def test_update_book_by_id_not_found(client, token):
+    response = client.patch(
+        f'/books/update-book/{99}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'title': 'harry potter'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Book not found!'}
+
+
+def test_update_book_by_id_without_changes(client, token, book):
+    book_schema = BookSchema.model_validate(book).model_dump()
+    response = client.patch(
+        f'/books/update-book/{book.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == book_schema
+
+
+@pytest.mark.asyncio
+async def test_get_books_by_ids_keeps_order_and_reports_missing(
+    client, token, book, session
+):
+    other_book = Book(title='iracema', year=1865, id_novelist=book.id_novelist)
+    session.add(other_book)
+    await session.commit()
+
+    response = client.get(
+        f'/books?ids={other_book.id},999&ids={book.id},{other_book.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item['id'] for item in response.json()['books']] == [
+        other_book.id,
+        book.id,
+    ]
+    assert response.json()['missing'] == [999]
+
+
+def test_get_books_by_ids_invalid(client, token):
+    response = client.get(
+        '/books?ids=1,x', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid ids!'}
+
+
+def test_get_books_by_ids_too_many(client, token, settings):
+    ids = ','.join(map(str, range(1, settings.BULK_LOOKUP_MAX_IDS + 2)))
+
+    response = client.get(
+        f'/books?ids={ids}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert response.json() == {'detail': 'Too many ids!'}
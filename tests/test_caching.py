@@ -0,0 +1,44 @@
+from freezegun import freeze_time
+
+from mader_project.caching import TTLCache
+
+
+def test_ttl_cache_get_and_set():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3  # noqa: PLR2004
+
+
+def test_ttl_cache_expires_entries():
+    with freeze_time('2025-12-31 12:00:00') as frozen:
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+
+        frozen.tick(61)
+
+        assert cache.get('a') is None
+
+
+def test_ttl_cache_disabled_with_zero_size():
+    cache = TTLCache(maxsize=0, ttl=60)
+
+    cache.set('a', 1)
+
+    assert cache.get('a') is None
@@ -0,0 +1,184 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+
+from mader_project.change_stream import (
+    OVERFLOW,
+    ChangeListener,
+    StreamEvent,
+    change_listener,
+)
+from mader_project.models import Novelist
+
+
+@pytest.fixture
+def database_url(engine):
+    return engine.url.render_as_string(hide_password=False)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_listener_receives_committed_changes(session, database_url):
+    listener = ChangeListener(database_url, queue_size=10)
+    subscription = await listener.subscribe()
+
+    session.add_all([Novelist(name='a'), Novelist(name='b')])
+    await session.commit()
+
+    event = await subscription.get(timeout=5)
+    await listener.close()
+
+    assert event.name == 'change'
+    assert json.loads(event.data) == {
+        'table': 'novelists',
+        'operation': 'insert',
+        'count': 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_listener_drops_slow_consumers(session, database_url):
+    listener = ChangeListener(database_url, queue_size=1)
+    fast = await listener.subscribe()
+    slow = await listener.subscribe()
+
+    listener.publish(StreamEvent('change', '1'))
+    await fast.get(timeout=1)
+    listener.publish(StreamEvent('change', '2'))
+
+    assert await fast.get(timeout=1) == StreamEvent('change', '2')
+    assert await slow.get(timeout=1) == OVERFLOW
+    assert listener.stats() == {
+        'subscribers': 1,
+        'delivered': 3,
+        'dropped': 1,
+        'reconnects': 0,
+        'listening': True,
+    }
+
+    await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_listener_close_ends_subscriptions(session, database_url):
+    listener = ChangeListener(database_url, queue_size=10)
+    subscription = await listener.subscribe()
+
+    await listener.close()
+
+    assert await subscription.get(timeout=1) is None
+    assert not listener.listening
+
+
+def test_stream_changes(client, token, database_url, monkeypatch):
+    monkeypatch.setattr(change_listener, 'url', database_url)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    with ThreadPoolExecutor(1) as executor:
+        stream = executor.submit(
+            client.get, '/changes/stream', headers=headers
+        )
+        wait_for(lambda: change_listener.metrics.subscribers == 1)
+
+        client.post(
+            '/novelists/create-novelist',
+            headers=headers,
+            json={'name': 'Clarice Lispector'},
+        )
+        wait_for(lambda: change_listener.metrics.delivered == 1)
+        client.portal.call(change_listener.close)
+
+        response = stream.result(timeout=5)
+
+    assert response.headers['content-type'].startswith('text/event-stream')
+    assert response.text == (
+        'event: change\n'
+        'data: {"table" : "novelists", "operation" : "insert", "count" : 1}'
+        '\n\n'
+    )
+    assert change_listener.metrics.subscribers == 0
+
+
+def test_stream_ends_after_overflow(client, token, database_url, monkeypatch):
+    monkeypatch.setattr(change_listener, 'url', database_url)
+    monkeypatch.setattr(change_listener, 'queue_size', 1)
+
+    async def flood():
+        # No await in between: the stream can't drain the queue
+        change_listener.publish(StreamEvent('change', '1'))
+        change_listener.publish(StreamEvent('change', '2'))
+
+    with ThreadPoolExecutor(1) as executor:
+        stream = executor.submit(
+            client.get,
+            '/changes/stream',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        wait_for(lambda: change_listener.metrics.subscribers == 1)
+
+        client.portal.call(flood)
+        response = stream.result(timeout=5)
+
+    client.portal.call(change_listener.close)
+
+    assert response.text == 'event: overflow\ndata: {}\n\n'
+    assert change_listener.metrics.dropped == 1
+    assert change_listener.metrics.subscribers == 0
+
+
+def test_stream_accepts_stream_token(client, token, database_url, monkeypatch):
+    monkeypatch.setattr(change_listener, 'url', database_url)
+    monkeypatch.setattr(change_listener, 'queue_size', 1)
+    stream_token = client.post(
+        '/changes/stream-token',
+        headers={'Authorization': f'Bearer {token}'},
+    ).json()['access_token']
+
+    async def flood():
+        change_listener.publish(StreamEvent('change', '1'))
+        change_listener.publish(StreamEvent('change', '2'))
+
+    # As EventSource connects: token in the query string, no header
+    with ThreadPoolExecutor(1) as executor:
+        stream = executor.submit(
+            client.get, '/changes/stream', params={'token': stream_token}
+        )
+        wait_for(lambda: change_listener.metrics.subscribers == 1)
+
+        client.portal.call(flood)
+        response = stream.result(timeout=5)
+
+    client.portal.call(change_listener.close)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text == 'event: overflow\ndata: {}\n\n'
+
+
+def test_stream_rejects_access_token_in_query(client, token):
+    response = client.get('/changes/stream', params={'token': token})
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert change_listener.metrics.subscribers == 0
+
+
+def test_stream_token_is_rejected_by_other_routes(client, token):
+    stream_token = client.post(
+        '/changes/stream-token',
+        headers={'Authorization': f'Bearer {token}'},
+    ).json()['access_token']
+
+    response = client.get(
+        '/changes', headers={'Authorization': f'Bearer {stream_token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+
+def changes_since(client, headers, since=None, **params):
+    if since:
+        params['since'] = since
+    return client.get('/changes', headers=headers, params=params).json()
+
+
+def test_changes_feed_in_commit_order(client, user, novelist, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    cursor = changes_since(client, headers)['next_cursor']
+
+    book_id = client.post(
+        '/books/create-book',
+        headers=headers,
+        json={'title': 'Iracema', 'year': 1865, 'id_novelist': novelist.id},
+    ).json()['id']
+    client.patch(
+        f'/books/update-book/{book_id}', headers=headers, json={'year': 1866}
+    )
+    client.post(f'/users/books-read/{book_id}', headers=headers)
+    client.put(
+        f'/novelists/edit-novelist/{novelist.id}',
+        headers=headers,
+        json={'name': 'José de Alencar'},
+    )
+
+    feed = changes_since(client, headers, cursor)
+
+    assert [
+        (change['table'], change['operation']) for change in feed['changes']
+    ] == [
+        ('books', 'insert'),
+        ('books', 'update'),
+        ('read_books_association', 'insert'),
+        ('novelists', 'update'),
+    ]
+    assert feed['changes'][1]['data'] == feed['changes'][1]['data'] | {
+        'id': book_id,
+        'title': 'iracema',
+        'year': 1866,
+    }
+    assert 'title_key' not in feed['changes'][0]['data']
+    assert not feed['has_more']
+
+
+def test_changes_feed_records_tombstones(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    cursor = changes_since(client, headers)['next_cursor']
+
+    client.delete(f'/books/delete-book/{book.id}', headers=headers)
+
+    feed = changes_since(client, headers, cursor)
+
+    assert [change['operation'] for change in feed['changes']] == ['delete']
+    assert feed['changes'][0]['data']['id'] == book.id
+
+
+def test_changes_feed_pages_with_cursor(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first = changes_since(client, headers, limit=1)
+    second = changes_since(client, headers, first['next_cursor'], limit=1)
+    empty = changes_since(client, headers, second['next_cursor'])
+
+    assert [c['table'] for c in first['changes']] == ['novelists']
+    assert [c['table'] for c in second['changes']] == ['books']
+    assert first['has_more']
+    assert empty['changes'] == []
+    assert empty['next_cursor'] == second['next_cursor']
+
+
+def test_changes_feed_skips_noop_updates(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    cursor = changes_since(client, headers)['next_cursor']
+
+    client.patch(
+        f'/books/update-book/{book.id}',
+        headers=headers,
+        json={'year': book.year},
+    )
+
+    assert changes_since(client, headers, cursor)['changes'] == []
+
+
+def test_changes_feed_invalid_cursor(client, token):
+    response = client.get(
+        '/changes',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'since': 'not-a-cursor'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor!'}
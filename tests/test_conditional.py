@@ -0,0 +1,190 @@
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+
+import pytest
+from fastapi import Request
+from sqlalchemy import select, update
+
+from mader_project.functions.conditional import Validators, page_validators
+from mader_project.models import Book
+from mader_project.schemas import PageParams
+
+
+def make_request(**headers):
+    return Request({
+        'type': 'http',
+        'headers': [
+            (name.replace('_', '-').encode(), value.encode())
+            for name, value in headers.items()
+        ],
+    })
+
+
+VALIDATORS = Validators(
+    etag='"abc"',
+    last_modified=datetime(2025, 10, 29, 12, 0, tzinfo=timezone.utc),
+)
+
+
+def test_if_none_match_accepts_lists_weak_tags_and_star():
+    assert VALIDATORS.not_modified(make_request(if_none_match='"x", "abc"'))
+    assert VALIDATORS.not_modified(make_request(if_none_match='W/"abc"'))
+    assert VALIDATORS.not_modified(make_request(if_none_match='*'))
+    assert not VALIDATORS.not_modified(make_request(if_none_match='"x"'))
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    request = make_request(
+        if_none_match='"x"',
+        if_modified_since='Wed, 29 Oct 2025 13:00:00 GMT',
+    )
+
+    assert not VALIDATORS.not_modified(request)
+
+
+def test_if_modified_since():
+    assert VALIDATORS.not_modified(
+        make_request(if_modified_since='Wed, 29 Oct 2025 12:00:00 GMT')
+    )
+    assert not VALIDATORS.not_modified(
+        make_request(if_modified_since='Wed, 29 Oct 2025 11:59:59 GMT')
+    )
+    assert not VALIDATORS.not_modified(
+        make_request(if_modified_since='not a date')
+    )
+
+
+def test_get_book_not_modified(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get(f'/books/get-book/{book.id}', headers=headers)
+    etag = response.headers['ETag']
+
+    by_etag = client.get(
+        f'/books/get-book/{book.id}',
+        headers=headers | {'If-None-Match': etag},
+    )
+    by_date = client.get(
+        f'/books/get-book/{book.id}',
+        headers=headers
+        | {'If-Modified-Since': response.headers['Last-Modified']},
+    )
+
+    assert by_etag.status_code == HTTPStatus.NOT_MODIFIED
+    assert by_etag.content == b''
+    assert by_etag.headers['ETag'] == etag
+    assert by_date.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_book_modified_after_update(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    etag = client.get(f'/books/get-book/{book.id}', headers=headers).headers[
+        'ETag'
+    ]
+    client.patch(
+        f'/books/update-book/{book.id}', headers=headers, json={'year': 1900}
+    )
+    response = client.get(
+        f'/books/get-book/{book.id}',
+        headers=headers | {'If-None-Match': etag},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['year'] == 1900  # noqa: PLR2004
+    assert response.headers['ETag'] != etag
+
+
+def test_get_book_not_found_has_no_etag(client, token):
+    response = client.get(
+        '/books/get-book/999',
+        headers={'Authorization': f'Bearer {token}', 'If-None-Match': '*'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert 'ETag' not in response.headers
+
+
+def test_get_novelist_not_modified(client, novelist, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    etag = client.get(f'/novelists/novelist/{novelist.id}', headers=headers)
+    response = client.get(
+        f'/novelists/novelist/{novelist.id}',
+        headers=headers | {'If-None-Match': etag.headers['ETag']},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_list_books_not_modified_until_create(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first = client.get('/books/list-all-books', headers=headers)
+    not_modified = client.get(
+        '/books/list-all-books',
+        headers=headers | {'If-None-Match': first.headers['ETag']},
+    )
+    client.post(
+        '/books/create-book',
+        headers=headers,
+        json={
+            'title': 'Iracema',
+            'year': 1865,
+            'id_novelist': book.id_novelist,
+        },
+    )
+    modified = client.get(
+        '/books/list-all-books',
+        headers=headers | {'If-None-Match': first.headers['ETag']},
+    )
+
+    assert 'Last-Modified' not in first.headers
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+    assert modified.status_code == HTTPStatus.OK
+    assert len(modified.json()['books']) == 2  # noqa: PLR2004
+
+
+def test_list_novelists_modified_after_delete(client, novelist, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    first = client.get('/novelists/list-novelists', headers=headers)
+    client.delete(f'/novelists/delete-novelist/{novelist.id}', headers=headers)
+    response = client.get(
+        '/novelists/list-novelists',
+        headers=headers | {'If-None-Match': first.headers['ETag']},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['novelists'] == []
+
+
+def test_list_pages_have_distinct_etags(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    full = client.get('/books/list-all-books', headers=headers)
+    limited = client.get('/books/list-all-books?limit=1', headers=headers)
+
+    assert full.headers['ETag'] != limited.headers['ETag']
+
+
+@pytest.mark.asyncio
+async def test_page_etag_changes_when_an_update_writes_an_older_timestamp(
+    session, book
+):
+    session.add(Book(title='iracema', year=1865, id_novelist=book.id_novelist))
+    await session.commit()
+    page = PageParams()
+
+    before = await page_validators(select(Book), Book.id, page, session)
+    # A transaction that started earlier but committed later: now()
+    # stamps its start, below the page's max(updated_at)
+    await session.execute(
+        update(Book)
+        .where(Book.id == book.id)
+        .values(year=1900, updated_at=Book.updated_at - timedelta(days=1))
+    )
+    await session.commit()
+    after = await page_validators(select(Book), Book.id, page, session)
+
+    assert before.etag != after.etag
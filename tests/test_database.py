@@ -0,0 +1,199 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import exc, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from mader_project import database
+from mader_project.app import app
+from mader_project.models import Book, Novelist
+from mader_project.response_cache import response_cache
+
+
+@pytest.fixture
+def small_pool_engine(engine, monkeypatch):
+    monkeypatch.setattr(database.settings, 'DATABASE_POOL_SIZE', 1)
+    monkeypatch.setattr(database.settings, 'DATABASE_MAX_OVERFLOW', 0)
+    monkeypatch.setattr(
+        database.settings, 'DATABASE_POOL_TIMEOUT_SECONDS', 0.1
+    )
+    return database.build_engine(
+        engine.url.render_as_string(hide_password=False)
+    )
+
+
+@pytest.fixture
+def request_sessions(client, engine):
+    # A fresh session per request, like get_session, on a metered pool
+    metered = database.build_engine(
+        engine.url.render_as_string(hide_password=False)
+    )
+
+    async def get_session():
+        async with AsyncSession(metered, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[database.get_session] = get_session
+    yield metered.pool
+
+    client.portal.call(metered.dispose)
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_checkouts_and_timeouts(small_pool_engine):
+    async with small_pool_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            await small_pool_engine.connect()
+
+        stats = small_pool_engine.pool.stats()
+
+    await small_pool_engine.dispose()
+
+    assert stats['checkouts'] == 2  # noqa: PLR2004
+    assert stats['timeouts'] == 1
+    assert stats['checked_out'] == 1
+    assert stats['overflow'] == 0
+    assert stats['max_wait_seconds'] >= 0.1  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_survive_dispose(small_pool_engine):
+    async with small_pool_engine.connect():
+        pass
+
+    metrics = small_pool_engine.pool.metrics
+    await small_pool_engine.dispose()
+
+    assert small_pool_engine.pool.metrics is metrics
+    assert small_pool_engine.pool.stats()['checkouts'] == 1
+
+
+def test_get_database_pool_stats(client, token):
+    response = client.get(
+        '/metrics/database-pool', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['size'] == database.settings.DATABASE_POOL_SIZE
+
+
+def test_metrics_require_authentication(client):
+    response = client.get('/metrics/database-pool')
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_reads_go_to_replica(client, book, token, replica):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get(
+        f'/books/list-book/{book.title}/{book.year}', headers=headers
+    )
+
+    # The book only exists on the primary
+    assert response.json()['books'] == []
+
+
+def test_writes_pin_user_to_primary(client, user, book, token, replica):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    client.patch(
+        f'/books/update-book/{book.id}', headers=headers, json={'year': 1900}
+    )
+    pinned = client.get(f'/books/get-book/{book.id}', headers=headers)
+
+    database.primary_pins.clear()
+    expired = client.get(f'/users/user/{user.id}', headers=headers)
+
+    assert pinned.status_code == HTTPStatus.OK
+    assert pinned.json()['year'] == 1900  # noqa: PLR2004
+    assert expired.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_failed_write_does_not_pin(client, book, token, replica):
+    headers = {'Authorization': f'Bearer {token}'}
+    # The conflict rolls back and expires the fixture's book
+    listing_path = f'/books/list-book/{book.title}/{book.year}'
+
+    response = client.post(
+        '/books/create-book',
+        headers=headers,
+        json={
+            'title': book.title,
+            'year': book.year,
+            'id_novelist': book.id_novelist,
+        },
+    )
+    listing = client.get(listing_path, headers=headers)
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert listing.json()['books'] == []
+
+
+def test_requests_check_out_at_most_one_connection(
+    client, book, token, request_sessions
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    path = f'/books/get-book/{book.id}'
+
+    def checkouts(*args, **kwargs):
+        before = request_sessions.metrics.checkouts
+        client.get(*args, **kwargs)
+        return request_sessions.metrics.checkouts - before
+
+    # The principal lookup, validators and load share one session
+    assert checkouts(path, headers=headers) == 1
+
+    etag = client.get(path, headers=headers).headers['ETag']
+
+    # Cached principal and response: nothing touches the database
+    assert checkouts(path, headers=headers) == 0
+    assert checkouts(path, headers=headers | {'If-None-Match': etag}) == 0
+    assert checkouts(path, headers={'Authorization': 'Bearer bad'}) == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_come_from_primary(
+    client, book, token, other_user, replica
+):
+    # The replica holds the book as it was before the write below
+    async with replica.begin() as conn:
+        await conn.execute(
+            insert(Novelist).values(id=book.id_novelist, name='replica')
+        )
+        await conn.execute(
+            insert(Book).values(
+                id=book.id,
+                id_novelist=book.id_novelist,
+                title=book.title,
+                year=book.year,
+            )
+        )
+    stale_year = book.year
+    writer = {'Authorization': f'Bearer {token}'}
+    reader = {
+        'Authorization': 'Bearer '
+        + client.post(
+            '/auth/token',
+            data={
+                'username': other_user.email,
+                'password': other_user.clean_password,
+            },
+        ).json()['access_token']
+    }
+
+    client.patch(
+        f'/books/update-book/{book.id}', headers=writer, json={'year': 1900}
+    )
+    hits = (await response_cache.stats())['hits']
+    first = client.get(f'/books/get-book/{book.id}', headers=reader)
+    second = client.get(f'/books/get-book/{book.id}', headers=reader)
+    pinned = client.get(f'/books/get-book/{book.id}', headers=writer)
+
+    # Neither reader gets the stale replica row, and the unpinned one
+    # fills the cache for everybody
+    assert stale_year != 1900  # noqa: PLR2004
+    assert first.json()['year'] == 1900  # noqa: PLR2004
+    assert second.json()['year'] == 1900  # noqa: PLR2004
+    assert pinned.json()['year'] == 1900  # noqa: PLR2004
+    assert (await response_cache.stats())['hits'] == hits + 2
@@ -0,0 +1,40 @@
+import json
+from http import HTTPStatus
+
+
+def test_export_books_ndjson(client, token, book):
+    response = client.get(
+        '/export/books', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {
+            'id': book.id,
+            'id_novelist': book.id_novelist,
+            'title': book.title,
+            'year': book.year,
+        }
+    ]
+
+
+def test_export_novelists_csv(client, token, novelist):
+    response = client.get(
+        '/export/novelists',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'format': 'csv'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.text.splitlines() == ['id,name', f'1,{novelist.name}']
+
+
+def test_export_books_empty(client, token):
+    response = client.get(
+        '/export/books', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert not response.text
@@ -0,0 +1,53 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+
+from mader_project.hashing import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_hash_and_verify():
+    hasher = PasswordHasher(executor='thread', max_workers=2, max_pending=4)
+
+    hashed = await hasher.hash('secret')
+
+    assert hashed != 'secret'
+    assert await hasher.verify('secret', hashed)
+    assert not await hasher.verify('wrong', hashed)
+    assert hasher.stats()['completed'] == 3  # noqa: PLR2004
+    assert hasher.stats()['pending'] == 0
+
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_is_full():
+    hasher = PasswordHasher(executor='thread', max_workers=1, max_pending=1)
+
+    results = await asyncio.gather(
+        hasher.hash('secret'), hasher.hash('secret'), return_exceptions=True
+    )
+
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert hasher.stats()['rejected'] == 1
+
+    hasher.shutdown()
+
+
+def test_password_hasher_stats_route(client, user):
+    token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()['access_token']
+
+    response = client.get(
+        '/metrics/password-hasher',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['completed'] >= 1
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from mader_project.importer import import_file
+from mader_project.models import Book, Novelist
+from mader_project.response_cache import MemoryBackend, response_cache
+
+
+@pytest.mark.asyncio
+async def test_import_novelists_csv(session, engine, tmp_path):
+    path = tmp_path / 'novelists.csv'
+    path.write_text(
+        'name\nMachado de Assis\nJose  de Alencar\nmachado de assis\n'
+    )
+
+    report = await import_file(engine, 'novelists', path, chunk_size=2)
+
+    names = (await session.scalars(select(Novelist.name))).all()
+    assert sorted(names) == ['jose de alencar', 'machado de assis']
+    assert report.rows_read == 3  # noqa: PLR2004
+    assert report.rows_inserted == 2  # noqa: PLR2004
+    assert report.chunks_done == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_import_books_ndjson_resolves_novelists(
+    session, engine, tmp_path
+):
+    novelist = Novelist(name='jose de alencar')
+    session.add(novelist)
+    await session.commit()
+
+    path = tmp_path / 'books.ndjson'
+    path.write_text(
+        '\n'.join([
+            json.dumps({
+                'title': 'Iracema',
+                'year': 1865,
+                'novelist': 'Jose de Alencar',
+            }),
+            json.dumps({
+                'title': 'iracema',
+                'year': 1865,
+                'novelist': 'jose de alencar',
+            }),
+            json.dumps({
+                'title': 'Senhora',
+                'year': 1875,
+                'novelist': 'unknown',
+            }),
+        ])
+    )
+
+    report = await import_file(engine, 'books', path)
+
+    books = (await session.scalars(select(Book))).all()
+    assert [(book.title, book.id_novelist) for book in books] == [
+        ('iracema', novelist.id)
+    ]
+    assert report.rows_inserted == 1
+
+
+@pytest.mark.asyncio
+async def test_import_resumes_after_failed_chunk(session, engine, tmp_path):
+    path = tmp_path / 'books.csv'
+    checkpoint = tmp_path / 'books.checkpoint'
+    session.add(Novelist(name='jose de alencar'))
+    await session.commit()
+
+    path.write_text(
+        'title,year,novelist\n'
+        'iracema,1865,jose de alencar\n'
+        'senhora,unknown,jose de alencar\n'
+    )
+    with pytest.raises(ValueError, match='invalid literal'):
+        await import_file(
+            engine, 'books', path, chunk_size=1, checkpoint=checkpoint
+        )
+
+    assert checkpoint.read_text() == '1'
+
+    path.write_text(path.read_text().replace('unknown', '1875'))
+    report = await import_file(
+        engine, 'books', path, chunk_size=1, checkpoint=checkpoint
+    )
+
+    titles = (await session.scalars(select(Book.title))).all()
+    assert sorted(titles) == ['iracema', 'senhora']
+    assert report.chunks_skipped == 1
+    assert report.chunks_done == 1
+
+
+@pytest.mark.asyncio
+async def test_import_warns_when_cache_is_not_shared(
+    session, engine, tmp_path, monkeypatch, capsys
+):
+    backend = MemoryBackend(max_entries=10, max_bytes=1024)
+    monkeypatch.setattr(response_cache, 'backend', backend)
+    path = tmp_path / 'novelists.csv'
+    path.write_text('name\nMachado de Assis\n')
+
+    await import_file(engine, 'novelists', path, chunk_size=10)
+
+    assert await backend.get_versions(('novelists',)) == [0]
+    assert 'response cache is not shared' in capsys.readouterr().out
@@ -1,7 +1,79 @@
-from mader_project.functions.normalize_text import normalize_text
+import pytest
+
+from mader_project.functions.normalize_text import (
+    TextNormalizer,
+    lookup_key,
+    lookup_keys,
+    normalize_many,
+    normalize_text,
+)
 
 
 def test_normalize_text():
     response = normalize_text('Leonardo Sanders')
 
     assert response == 'leonardo sanders'
+
+
+@pytest.mark.parametrize(
+    ('text', 'expected'),
+    [
+        (
+            'Memórias  Póstumas de Brás Cubas',
+            'memórias póstumas de brás cubas',
+        ),
+        ('Grande Sertão: Veredas', 'grande sertão veredas'),
+        ('Memo\u0301rias', 'memórias'),
+        ('  Volume 2 \t', 'volume 2'),
+        ('Война и мир', 'война и мир'),
+        ('!!!', ''),
+    ],
+)
+def test_normalize_text_keeps_accents_and_digits(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    ('text', 'expected'),
+    [
+        ('MEMÓRIAS  PÓSTUMAS', 'memorias postumas'),
+        ('memórias póstumas', 'memorias postumas'),
+        ('Die Straße', 'die strasse'),
+        ('ﬁcção ½', 'ficcao 12'),
+    ],
+)
+def test_lookup_key_folds_accents_and_case(text, expected):
+    assert lookup_key(text) == expected
+
+
+def test_normalize_many_matches_normalize_text():
+    texts = [
+        'Dom Casmurro',
+        ' O Cortiço ',
+        'A - B',
+        'Ωmega',
+        'nul\x00byte',
+        '',
+        '?',
+        'Straße µ',
+    ] * 3
+
+    assert normalize_many(texts) == [normalize_text(text) for text in texts]
+    assert lookup_keys(texts) == [lookup_key(text) for text in texts]
+
+
+@pytest.mark.parametrize(
+    'normalizer', [TextNormalizer(), TextNormalizer(fold=True)]
+)
+def test_byte_table_agrees_with_code_point_table(normalizer):
+    # ' Ω' pushes the text off the Latin-1 fast path
+    for byte in range(256):
+        text = f'x{chr(byte)}x'
+
+        assert normalizer(f'{text} Ω') == f'{normalizer(text)} ω'
+
+
+def test_text_normalizer_keep():
+    normalizer = TextNormalizer(keep="'-")
+
+    assert normalizer("D'Água - Viva!") == "d'água - viva"
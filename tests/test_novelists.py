@@ -1,5 +1,9 @@
 from http import HTTPStatus
 
+import pytest
+
+from mader_project.functions import func_novelists_utils as novelists_utils
+from mader_project.models import Book, Novelist
 from mader_project.schemas import NovelistAllInfoSchema
 
 
@@ -38,7 +42,7 @@ def test_get_all_novelists(client, token):
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'novelists': []}
+    assert response.json() == {'novelists': [], 'next_cursor': None}
 
 
 def test_get_novelist_by_filter_name(client, novelist, token):
@@ -51,7 +55,10 @@ def test_get_novelist_by_filter_name(client, novelist, token):
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'novelists': [novelist_schema]}
+    assert response.json() == {
+        'novelists': [novelist_schema],
+        'next_cursor': None,
+    }
 
 
 def test_get_novelist_by_id(client, novelist, token):
@@ -85,6 +92,23 @@ def test_edit_novelist_by_id(client, token, novelist):
     assert response.json() == {'name': 'eduardo spohr'}
 
 
+def test_edit_novelist_by_id_conflict(client, token, novelist):
+    client.post(
+        '/novelists/create-novelist',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'name': 'eduardo spohr'},
+    )
+
+    response = client.put(
+        f'/novelists/edit-novelist/{novelist.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'name': 'Eduardo Spohr'},
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'Novelist already exists!'}
+
+
 def test_delete_novelist_by_id(client, token, novelist):
     response = client.delete(
         f'/novelists/delete-novelist/{novelist.id}',
@@ -93,3 +117,101 @@ def test_delete_novelist_by_id(client, token, novelist):
 
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {'message': 'Novelist deleted!'}
+
+
+def test_edit_novelist_by_id_not_found(client, token):
+    response = client.put(
+        f'/novelists/edit-novelist/{99}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'name': 'eduardo spohr'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Novelist not found!'}
+
+
+def test_delete_novelist_by_id_not_found(client, token):
+    response = client.delete(
+        f'/novelists/delete-novelist/{99}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Novelist not found!'}
+
+
+def test_delete_novelist_with_read_books(client, token, user, book):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post(f'/users/books-read/{book.id}', headers=headers)
+    client.get('/books/list-all-books', headers=headers)
+
+    response = client.delete(
+        f'/novelists/delete-novelist/{book.id_novelist}', headers=headers
+    )
+    books = client.get('/books/list-all-books', headers=headers)
+    user = client.get(
+        f'/users/user/{user.id}?expand=read_books', headers=headers
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Novelist deleted!'}
+    assert books.json()['books'] == []
+    assert user.json()['read_books'] == []
+
+
+def test_get_novelists_by_ids(client, token, novelist):
+    response = client.get(
+        f'/novelists?ids=999&ids={novelist.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'novelists': [{'id': novelist.id, 'name': novelist.name}],
+        'missing': [999],
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_novelist_with_books_limits_each_novelist(
+    client, token, novelist, session, monkeypatch
+):
+    monkeypatch.setattr(novelists_utils.settings, 'NOVELIST_BOOKS_LIMIT', 2)
+    other = Novelist(name='Machado de Assis')
+    session.add(other)
+    await session.flush()
+    session.add_all(
+        [
+            Book(title=f'a{n}', year=1900, id_novelist=novelist.id)
+            for n in range(3)
+        ]
+        + [Book(title='dom casmurro', year=1899, id_novelist=other.id)]
+    )
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    single = client.get(
+        f'/novelists/novelist/{novelist.id}/with-books', headers=headers
+    )
+    batch = client.get(
+        f'/novelists/with-books?ids={other.id},999,{novelist.id}',
+        headers=headers,
+    )
+
+    assert single.status_code == HTTPStatus.OK
+    assert [book['title'] for book in single.json()['books']] == ['a0', 'a1']
+    assert [
+        (item['name'], len(item['books']))
+        for item in batch.json()['novelists']
+    ] == [('Machado de Assis', 1), (novelist.name, 2)]
+    assert batch.json()['missing'] == [999]
+
+
+def test_get_novelist_with_books_not_found(client, token):
+    response = client.get(
+        '/novelists/novelist/999/with-books',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Novelist not found!'}
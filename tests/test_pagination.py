@@ -0,0 +1,17 @@
+from mader_project.functions.pagination import (
+    decode_cursor,
+    encode_cursor,
+    page_limit,
+)
+from mader_project.schemas import PageParams
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42  # noqa: PLR2004
+
+
+def test_page_limit_is_capped(settings):
+    page = PageParams(limit=settings.PAGE_SIZE_MAX + 1)
+
+    assert page_limit(page) == settings.PAGE_SIZE_MAX
+    assert page_limit(PageParams()) == settings.PAGE_SIZE_DEFAULT
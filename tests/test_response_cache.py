@@ -0,0 +1,361 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import Request
+from freezegun import freeze_time
+
+from mader_project.functions.conditional import Validators
+from mader_project.response_cache import (
+    CacheBackendError,
+    MemoryBackend,
+    RedisBackend,
+    ResponseCache,
+)
+from mader_project.schemas import BookSchema
+
+
+class FakeRedis:
+    """Just enough of a Redis server for RedisBackend."""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        while line := await reader.readline():
+            args = []
+            for _ in range(int(line[1:])):
+                size = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(size + 2))[:-2])
+
+            self.commands.append(args[0].decode())
+            writer.write(self.reply(args[0].decode(), args[1:]))
+            await writer.drain()
+
+        writer.close()
+
+    def reply(self, command, args):  # noqa: PLR0911
+        if command in {'AUTH', 'SELECT'}:
+            return b'+OK\r\n'
+        if command == 'GET':
+            return bulk(self.data.get(args[0]))
+        if command == 'SET':
+            self.data[args[0]] = args[1]
+            return b'+OK\r\n'
+        if command == 'MGET':
+            return f'*{len(args)}\r\n'.encode() + b''.join(
+                bulk(self.data.get(key)) for key in args
+            )
+        if command == 'INCR':
+            self.data[args[0]] = b'%d' % (int(self.data.get(args[0], 0)) + 1)
+            return b':' + self.data[args[0]] + b'\r\n'
+        if command == 'FLUSHDB':
+            self.data.clear()
+            return b'+OK\r\n'
+        if command == 'DBSIZE':
+            return b':%d\r\n' % len(self.data)
+        if command == 'INFO':
+            return bulk(b'# Memory\r\nused_memory:1024\r\nmaxmemory:0\r\n')
+        return b'-ERR unknown command\r\n'
+
+
+def bulk(value):
+    if value is None:
+        return b'$-1\r\n'
+    return b'$%d\r\n%s\r\n' % (len(value), value)
+
+
+def make_request(path='/books/get-book/1', query=b'', headers=()):
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'scheme': 'http',
+        'server': ('testserver', 80),
+        'path': path,
+        'query_string': query,
+        'headers': list(headers),
+    })
+
+
+def make_loader(calls):
+    async def load():
+        calls.append(1)
+        return {'id': 1, 'id_novelist': 1, 'title': 'iracema', 'year': 1865}
+
+    return load
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2, max_bytes=1024)
+
+    await backend.set('a', b'1', ttl=60)
+    await backend.set('b', b'2', ttl=60)
+    await backend.get('a')
+    await backend.set('c', b'3', ttl=60)
+
+    assert await backend.get('a') == b'1'
+    assert await backend.get('b') is None
+    assert (await backend.stats())['evictions'] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_by_bytes():
+    backend = MemoryBackend(max_entries=10, max_bytes=10)
+
+    await backend.set('a', b'1234', ttl=60)
+    await backend.set('b', b'5678', ttl=60)
+    await backend.set('c', b'9', ttl=60)
+    await backend.set('d', b'big' * 10, ttl=60)
+
+    assert await backend.get('a') is None
+    assert await backend.get('b') == b'5678'
+    assert await backend.get('d') is None
+    assert (await backend.stats())['bytes'] == 7  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_entries():
+    with freeze_time('2025-12-31 12:00:00') as frozen:
+        backend = MemoryBackend(max_entries=10, max_bytes=1024)
+        await backend.set('a', b'1', ttl=60)
+
+        frozen.tick(61)
+
+        assert await backend.get('a') is None
+        assert (await backend.stats())['entries'] == 0
+
+
+@pytest.mark.asyncio
+async def test_response_cache_hits_until_version_bump():
+    cache = ResponseCache(
+        MemoryBackend(max_entries=10, max_bytes=1024),
+        ttl=60,
+        max_entry_bytes=1024,
+    )
+    calls = []
+
+    first = await cache.respond(
+        make_request(), ('books',), BookSchema, make_loader(calls)
+    )
+    second = await cache.respond(
+        make_request(), ('books',), BookSchema, make_loader(calls)
+    )
+    await cache.bump('books')
+    await cache.respond(
+        make_request(), ('books',), BookSchema, make_loader(calls)
+    )
+
+    assert first.body == second.body
+    assert len(calls) == 2  # noqa: PLR2004
+    assert (await cache.stats())['hit_ratio'] == 1 / 3
+
+
+@pytest.mark.asyncio
+async def test_response_cache_answers_from_stored_validators():
+    cache = ResponseCache(
+        MemoryBackend(max_entries=10, max_bytes=1024),
+        ttl=60,
+        max_entry_bytes=1024,
+    )
+    calls, validations = [], []
+
+    async def validate():
+        validations.append(1)
+        return Validators(etag='"abc"')
+
+    first = await cache.respond(
+        make_request(), ('books',), BookSchema, make_loader(calls), validate
+    )
+    cached = await cache.respond(
+        make_request(headers=[(b'if-none-match', b'"abc"')]),
+        ('books',),
+        BookSchema,
+        make_loader(calls),
+        validate,
+    )
+
+    assert first.headers['ETag'] == '"abc"'
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert cached.headers['ETag'] == '"abc"'
+    assert len(calls) == len(validations) == 1
+
+
+@pytest.mark.asyncio
+async def test_response_cache_not_modified_miss_skips_load():
+    cache = ResponseCache(
+        MemoryBackend(max_entries=10, max_bytes=1024),
+        ttl=60,
+        max_entry_bytes=1024,
+    )
+    calls = []
+
+    async def validate():
+        return Validators(etag='"abc"')
+
+    response = await cache.respond(
+        make_request(headers=[(b'if-none-match', b'"abc"')]),
+        ('books',),
+        BookSchema,
+        make_loader(calls),
+        validate,
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert calls == []
+    assert (await cache.stats())['entries'] == 0
+
+
+@pytest.mark.asyncio
+async def test_response_cache_key_ignores_query_order():
+    cache = ResponseCache(
+        MemoryBackend(max_entries=10, max_bytes=1024),
+        ttl=60,
+        max_entry_bytes=1024,
+    )
+    calls = []
+
+    await cache.respond(
+        make_request(query=b'limit=5&cursor=x'),
+        ('books',),
+        BookSchema,
+        make_loader(calls),
+    )
+    await cache.respond(
+        make_request(query=b'cursor=x&limit=5'),
+        ('books',),
+        BookSchema,
+        make_loader(calls),
+    )
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_oversized_entries():
+    cache = ResponseCache(
+        MemoryBackend(max_entries=10, max_bytes=1024),
+        ttl=60,
+        max_entry_bytes=10,
+    )
+    calls = []
+
+    for _ in range(2):
+        await cache.respond(
+            make_request(), ('books',), BookSchema, make_loader(calls)
+        )
+
+    assert len(calls) == 2  # noqa: PLR2004
+    assert (await cache.stats())['entries'] == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip():
+    async with FakeRedis() as server:
+        backend = RedisBackend(f'redis://:secret@127.0.0.1:{server.port}/2')
+        cache = ResponseCache(backend, ttl=60, max_entry_bytes=1024)
+        calls = []
+
+        for _ in range(2):
+            response = await cache.respond(
+                make_request(), ('books',), BookSchema, make_loader(calls)
+            )
+        await cache.bump('books')
+        stats = await cache.stats()
+        await cache.close()
+
+    assert response.body == (
+        b'{"id":1,"id_novelist":1,"title":"iracema","year":1865}'
+    )
+    assert len(calls) == 1
+    assert server.commands[:2] == ['AUTH', 'SELECT']
+    assert server.data[b'version:books'] == b'1'
+    assert stats['entries'] == 2  # noqa: PLR2004
+    assert stats['bytes'] == 1024  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_raises_on_error_reply():
+    async with FakeRedis() as server:
+        backend = RedisBackend(f'redis://127.0.0.1:{server.port}/0')
+
+        with pytest.raises(CacheBackendError, match='unknown command'):
+            await backend.execute('PING')
+
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_response_cache_degrades_when_backend_is_down():
+    async with FakeRedis() as server:
+        port = server.port
+
+    cache = ResponseCache(
+        RedisBackend(f'redis://127.0.0.1:{port}/0'),
+        ttl=60,
+        max_entry_bytes=1024,
+    )
+    calls = []
+
+    response = await cache.respond(
+        make_request(), ('books',), BookSchema, make_loader(calls)
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(calls) == 1
+    assert (await cache.stats())['errors'] == 1
+
+
+def test_get_book_served_from_cache_until_update(client, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    year = book.year
+
+    client.get(f'/books/get-book/{book.id}', headers=headers)
+    cached = client.get(f'/books/get-book/{book.id}', headers=headers)
+    client.patch(
+        f'/books/update-book/{book.id}', headers=headers, json={'year': 1900}
+    )
+    updated = client.get(f'/books/get-book/{book.id}', headers=headers)
+
+    assert cached.json()['year'] == year
+    assert updated.json()['year'] == 1900  # noqa: PLR2004
+
+    stats = client.get('/metrics/response-cache', headers=headers).json()
+    assert stats['backend'] == 'MemoryBackend'
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2  # noqa: PLR2004
+
+
+def test_list_novelists_invalidated_by_create(client, novelist, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    before = client.get('/novelists/list-novelists', headers=headers)
+    client.post(
+        '/novelists/create-novelist',
+        headers=headers,
+        json={'name': 'Clarice Lispector'},
+    )
+    after = client.get('/novelists/list-novelists', headers=headers)
+
+    assert len(before.json()['novelists']) == 1
+    assert len(after.json()['novelists']) == 2  # noqa: PLR2004
+
+
+def test_get_book_not_found_is_not_cached(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.get('/books/get-book/999', headers=headers)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    stats = client.get('/metrics/response-cache', headers=headers).json()
+    assert stats['entries'] == 0
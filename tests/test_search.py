@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+from mader_project.functions.search import contains_pattern
+
+
+def test_contains_pattern_escapes_wildcards():
+    assert contains_pattern('harry') == '%harry%'
+    assert contains_pattern('100%_off\\') == '%100\\%\\_off\\\\%'
+
+
+def _create_catalog(client, headers):
+    for name in ('jose de alencar', 'machado de assis'):
+        client.post(
+            '/novelists/create-novelist', headers=headers, json={'name': name}
+        )
+
+    client.post(
+        '/books/bulk-create',
+        headers=headers,
+        json={
+            'books': [
+                {'id_novelist': 1, 'title': 'iracema', 'year': 1865},
+                {'id_novelist': 1, 'title': 'senhora', 'year': 1875},
+                {'id_novelist': 2, 'title': 'senhora de alencar', 'year': 1},
+                {'id_novelist': 2, 'title': 'dom casmurro', 'year': 1899},
+            ]
+        },
+    )
+
+
+def test_search_ranks_title_over_novelist(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    _create_catalog(client, headers)
+
+    response = client.get('/search', headers=headers, params={'q': 'alencar'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [hit['title'] for hit in response.json()['results']] == [
+        'senhora de alencar',
+        'iracema',
+        'senhora',
+    ]
+    assert response.json()['results'][1]['novelist'] == 'jose de alencar'
+
+
+def test_search_paginates_by_rank(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    _create_catalog(client, headers)
+
+    first_page = client.get(
+        '/search', headers=headers, params={'q': 'alencar', 'limit': 2}
+    ).json()
+    second_page = client.get(
+        '/search',
+        headers=headers,
+        params={
+            'q': 'alencar',
+            'limit': 2,
+            'cursor': first_page['next_cursor'],
+        },
+    ).json()
+
+    assert [hit['title'] for hit in first_page['results']] == [
+        'senhora de alencar',
+        'iracema',
+    ]
+    assert [hit['title'] for hit in second_page['results']] == ['senhora']
+    assert second_page['next_cursor'] is None
+
+
+def test_search_follows_novelist_rename(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    _create_catalog(client, headers)
+
+    client.put(
+        '/novelists/edit-novelist/2',
+        headers=headers,
+        json={'name': 'joaquim maria'},
+    )
+
+    response = client.get('/search', headers=headers, params={'q': 'joaquim'})
+
+    assert [hit['title'] for hit in response.json()['results']] == [
+        'senhora de alencar',
+        'dom casmurro',
+    ]
+
+
+def test_search_invalid_cursor(client, token):
+    response = client.get(
+        '/search',
+        headers={'Authorization': f'Bearer {token}'},
+        params={'q': 'alencar', 'cursor': 'nope'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor!'}
@@ -1,8 +1,16 @@
 from http import HTTPStatus
 
-from jwt import decode
+import pytest
+from freezegun import freeze_time
+from jwt import ExpiredSignatureError, decode
 
-from mader_project.security import create_access_token
+from mader_project.security import (
+    create_access_token,
+    decode_access_token,
+    principal_cache,
+    settings,
+    token_cache,
+)
 
 
 def test_jwt(settings):
@@ -46,3 +54,73 @@ def test_get_current_user_not_user(client):
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_get_current_user_uses_principal_cache(client, user, token):
+    principal_cache.clear()
+
+    for _ in range(2):
+        client.post(
+            '/auth/refresh-access-token',
+            headers={'Authorization': f'Bearer {token}'},
+        )
+
+    assert principal_cache.stats()['misses'] == 1
+    assert principal_cache.stats()['hits'] == 1
+
+
+def test_edit_user_invalidates_principal_cache(client, user, token):
+    client.post(
+        '/auth/refresh-access-token',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert principal_cache.get(user.email) is not None
+
+    client.put(
+        f'/users/user-to-edit/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'name': 'leonardo',
+            'email': 'leonardo@example.com',
+            'password': 'secret',
+        },
+    )
+
+    assert principal_cache.get(user.email) is None
+
+
+def test_decode_access_token_caches_verified_tokens():
+    token_cache.clear()
+    token = create_access_token({'sub': 'test@test.com'})
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    assert token_cache.stats()['misses'] == 1
+    assert token_cache.stats()['hits'] == 1
+
+
+def test_decode_access_token_cached_token_expires():
+    token_cache.clear()
+
+    with freeze_time('2025-12-31 12:00:00'):
+        token = create_access_token({'sub': 'test@test.com'})
+        decode_access_token(token)
+
+    with (
+        freeze_time('2025-12-31 12:31:00'),
+        pytest.raises(ExpiredSignatureError),
+    ):
+        decode_access_token(token)
+
+
+def test_decode_access_token_cache_disabled(monkeypatch):
+    token_cache.clear()
+    monkeypatch.setattr(settings, 'TOKEN_CACHE_ENABLED', False)
+    token = create_access_token({'sub': 'test@test.com'})
+
+    decode_access_token(token)
+    decode_access_token(token)
+
+    assert token_cache.stats()['size'] == 0
@@ -1,6 +1,12 @@
 from http import HTTPStatus
 
-from mader_project.schemas import UserPublicBooks
+import pytest
+from sqlalchemy import func, select
+
+from mader_project.functions import func_users_utils as users_utils
+from mader_project.hashing import password_hasher
+from mader_project.models import Read_Books_Association
+from mader_project.schemas import UserPublic
 
 
 def test_create_user(client):
@@ -46,18 +52,20 @@ def test_create_user_conflict_email(client, user):
 
 
 def test_list_all_users(client, user, novelist, token):
-    user_schema = UserPublicBooks.model_validate(user).model_dump()
+    user_schema = UserPublic.model_validate(user).model_dump()
+    user_schema['read_books'] = None
 
     response = client.get(
         '/users/list-all-users', headers={'Authorization': f'Bearer {token}'}
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': [user_schema]}
+    assert response.json() == {'users': [user_schema], 'next_cursor': None}
 
 
 def test_get_user_by_id(client, user, token):
-    user_schema = UserPublicBooks.model_validate(user).model_dump()
+    user_schema = UserPublic.model_validate(user).model_dump()
+    user_schema['read_books'] = None
     response = client.get(
         f'/users/user/{user.id}', headers={'Authorization': f'Bearer {token}'}
     )
@@ -105,8 +113,9 @@ def test_edit_user_by_id_not_found_error(client, token):
         },
     )
 
-    assert response.status_code == HTTPStatus.NOT_FOUND
-    assert response.json() == {'detail': 'User not found!'}
+    # Permission is checked before the lookup, and before hashing
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {'detail': 'Not enough permission!'}
 
 
 def test_edit_user_by_id_integrity_error(client, user, other_user, token):
@@ -124,7 +133,14 @@ def test_edit_user_by_id_integrity_error(client, user, other_user, token):
     assert response.json() == {'detail': 'Username or Email already exists!'}
 
 
-def test_edit_user_by_id_forbidden_error(client, other_user, token):
+def test_edit_user_by_id_forbidden_error(
+    client, other_user, token, monkeypatch
+):
+    async def hash_password(password):
+        raise AssertionError('hashed a forbidden edit')
+
+    monkeypatch.setattr(password_hasher, 'hash', hash_password)
+
     response = client.put(
         f'/users/user-to-edit/{other_user.id}',
         headers={'Authorization': f'Bearer {token}'},
@@ -149,6 +165,19 @@ def test_delete_user_by_id(client, user, token):
     assert response.json() == {'message': 'User deleted!'}
 
 
+@pytest.mark.asyncio
+async def test_delete_user_with_read_books(client, user, book, token, session):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post(f'/users/books-read/{book.id}', headers=headers)
+
+    response = client.delete(f'/users/delete-user/{user.id}', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert not await session.scalar(
+        select(func.count()).select_from(Read_Books_Association)
+    )
+
+
 def test_books_read_by_users_not_found_error(client, token):
     response = client.post(
         f'/users/books-read/{99}', headers={'Authorization': f'Bearer {token}'}
@@ -166,3 +195,135 @@ def test_create_book_read_by_user(client, book, novelist, token):
 
     assert response.status_code == HTTPStatus.CREATED
     assert response.json() == {'message': 'Book added to the user book list!'}
+
+
+def test_create_books_read_by_user_is_idempotent(client, user, book, token):
+    user_id, book_id = user.id, book.id
+
+    for _ in range(2):
+        response = client.post(
+            '/users/books-read',
+            headers={'Authorization': f'Bearer {token}'},
+            json={'book_ids': [book_id, book_id]},
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {'message': 'Books added to the user book list!'}
+
+    response = client.get(
+        f'/users/{user_id}/read-books',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    assert [b['id'] for b in response.json()['books']] == [book_id]
+
+
+def test_create_books_read_by_user_not_found_error(client, book, token):
+    response = client.post(
+        '/users/books-read',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'book_ids': [book.id, 99]},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Book not found!'}
+
+
+def test_list_read_books_paginated(client, user, novelist, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.post(
+        '/books/bulk-create',
+        headers=headers,
+        json={
+            'books': [
+                {'id_novelist': novelist.id, 'title': title, 'year': 1900}
+                for title in ('iracema', 'senhora', 'luciola')
+            ]
+        },
+    )
+    book_ids = [item['id'] for item in response.json()['results']]
+    client.post(
+        '/users/books-read', headers=headers, json={'book_ids': book_ids}
+    )
+
+    first_page = client.get(
+        f'/users/{user.id}/read-books', headers=headers, params={'limit': 2}
+    ).json()
+    second_page = client.get(
+        f'/users/{user.id}/read-books',
+        headers=headers,
+        params={'limit': 2, 'cursor': first_page['next_cursor']},
+    ).json()
+
+    assert [b['id'] for b in first_page['books']] == book_ids[:2]
+    assert [b['id'] for b in second_page['books']] == book_ids[2:]
+    assert second_page['next_cursor'] is None
+
+
+def test_get_user_by_id_expand_read_books(client, user, book, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.post(f'/users/books-read/{book.id}', headers=headers)
+
+    response = client.get(
+        f'/users/user/{user.id}',
+        headers=headers,
+        params={'expand': 'read_books'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [b['id'] for b in response.json()['read_books']] == [book.id]
+
+
+def test_list_all_users_expand_read_books_is_capped(
+    client, user, novelist, token, monkeypatch
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.post(
+        '/books/bulk-create',
+        headers=headers,
+        json={
+            'books': [
+                {'id_novelist': novelist.id, 'title': title, 'year': 1900}
+                for title in ('iracema', 'senhora', 'luciola')
+            ]
+        },
+    )
+    book_ids = [item['id'] for item in response.json()['results']]
+    client.post(
+        '/users/books-read', headers=headers, json={'book_ids': book_ids}
+    )
+    monkeypatch.setattr(users_utils.settings, 'READ_BOOKS_EXPAND_LIMIT', 2)
+
+    response = client.get(
+        '/users/list-all-users',
+        headers=headers,
+        params={'expand': 'read_books'},
+    )
+
+    [user_payload] = response.json()['users']
+    assert [b['id'] for b in user_payload['read_books']] == book_ids[:2]
+
+
+def test_list_read_books_user_not_found(client, token):
+    response = client.get(
+        '/users/99/read-books', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'User not found!'}
+
+
+@pytest.mark.asyncio
+async def test_get_users_by_ids_skips_inactive(
+    client, user, other_user, token, session
+):
+    other_user.status = False
+    await session.commit()
+
+    response = client.get(
+        f'/users?ids={other_user.id},{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item['id'] for item in response.json()['users']] == [user.id]
+    assert response.json()['missing'] == [other_user.id]